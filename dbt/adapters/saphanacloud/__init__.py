@@ -1,5 +1,6 @@
 from dbt.adapters.saphanacloud.connections import SapHanaCloudConnectionManager # noqa
 from dbt.adapters.saphanacloud.connections import SapHanaCloudCredentials
+from dbt.adapters.saphanacloud.connections import SapHanaCloudAdapterResponse # noqa
 from dbt.adapters.saphanacloud.impl import SapHanaCloudAdapter
 
 from dbt.adapters.base import AdapterPlugin
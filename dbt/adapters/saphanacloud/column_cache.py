@@ -0,0 +1,58 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from dbt.adapters.base.relation import BaseRelation
+
+
+def _key(relation: BaseRelation) -> Tuple[str, str]:
+    # Quoted names are case-sensitive, "orders" and "ORDERS" are different tables
+    return (
+        (relation.schema or "").replace('"', ""),
+        (relation.identifier or "").replace('"', ""),
+    )
+
+
+class ColumnCache:
+    """
+    Columns of the relations looked up during one dbt invocation, keyed by
+    schema and name. Entries are dropped whenever the adapter creates,
+    alters, renames or drops the relation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._columns: Dict[Tuple[str, str], List[Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, relation: BaseRelation) -> Optional[List[Any]]:
+        """Returns a copy of the relation's cached columns, or None when they aren't cached."""
+        with self._lock:
+            columns = self._columns.get(_key(relation))
+            if columns is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return list(columns)
+
+    def put(self, relation: BaseRelation, columns: List[Any]) -> None:
+        with self._lock:
+            self._columns[_key(relation)] = list(columns)
+
+    def invalidate(self, relation: BaseRelation) -> None:
+        with self._lock:
+            self._columns.pop(_key(relation), None)
+
+    def invalidate_schema(self, schema: str) -> None:
+        schema = schema.replace('"', "")
+        with self._lock:
+            for key in [key for key in self._columns if key[0] == schema]:
+                del self._columns[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "relations": len(self._columns)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._columns.clear()
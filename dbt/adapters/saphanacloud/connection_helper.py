@@ -1,5 +1,159 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# Client info the adapter keeps set for the whole session, see SapHanaCloudHandle
+SESSION_CLIENT_INFO = ("APPLICATION", "APPLICATIONUSER", "APPLICATIONCOMPONENT", "DBT_NODE_ID")
+
+
 class SapHanaCloudConnection:
     def __init__(self, handle, name):
         self.handle = handle  # The actual database connection handle
         self.name = name  # Connection name
-        self.transaction_open = False  # Indicates if a transaction is open
\ No newline at end of file
+        self.transaction_open = False  # Indicates if a transaction is open
+
+
+class StatementCache:
+    """
+    LRU cache of cursors which each hold one prepared statement, keyed by the
+    statement's SQL text. Evicted cursors are closed, which drops their
+    prepared statement on the server.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._cursors: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sql: str, new_cursor: Callable[[], Any]):
+        cursor = self._cursors.get(sql)
+        if cursor is not None:
+            self._cursors.move_to_end(sql)
+            self.hits += 1
+            return cursor
+
+        self.misses += 1
+        cursor = new_cursor()
+        try:
+            cursor.prepare(sql)
+        except Exception:
+            cursor.close()
+            raise
+
+        self._cursors[sql] = cursor
+        if len(self._cursors) > self.size:
+            _, evicted = self._cursors.popitem(last=False)
+            evicted.close()
+        return cursor
+
+    def discard(self, sql: str) -> None:
+        cursor = self._cursors.pop(sql, None)
+        if cursor is not None:
+            cursor.close()
+
+    def clear(self) -> None:
+        while self._cursors:
+            _, cursor = self._cursors.popitem()
+            cursor.close()
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def __str__(self) -> str:
+        lookups = self.hits + self.misses
+        hit_rate = 100 * self.hits / lookups if lookups else 0
+        return (
+            f"{self.hits} hits, {self.misses} misses ({hit_rate:.0f}% hit rate), "
+            f"{len(self)} of {self.size} statements prepared"
+        )
+
+
+class SapHanaCloudHandle:
+    """
+    An hdbcli connection together with the state the adapter keeps per
+    database session. Everything else is passed through to the connection.
+    """
+
+    def __init__(self, connection, statement_cache_size: int = 0):
+        self.connection = connection
+        self.statements = StatementCache(statement_cache_size)
+        # Cursors handed out for a single statement, closed once their result
+        # is consumed. Cursors of the statement cache are not tracked here.
+        self.open_cursors: Set[Any] = set()
+        # dbt node the session is tagged with in its client info
+        self.node_id: Optional[str] = None
+        # Workload class the session is mapped to via its client info
+        self.workload_class: Optional[str] = None
+        # Session variables set for the running node, unset when it is done
+        self.session_variables: Dict[str, str] = {}
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+    def tag_node(self, node_id: Optional[str]) -> bool:
+        """
+        Sets the DBT_NODE_ID client info when the node changed. hdbcli sends
+        client info along with the next statement, so this costs no round trip.
+        """
+        if node_id == self.node_id:
+            return False
+        self.connection.setclientinfo("DBT_NODE_ID", node_id or "")
+        self.node_id = node_id
+        return True
+
+    def track_cursor(self, cursor) -> int:
+        self.open_cursors.add(cursor)
+        return len(self.open_cursors)
+
+    def close_cursor(self, cursor) -> None:
+        if cursor in self.open_cursors:
+            self.open_cursors.discard(cursor)
+            cursor.close()
+
+    def set_workload_class(self, workload_class: Optional[str]) -> Optional[str]:
+        """
+        Sets the APPLICATIONCOMPONENT client info, which workload mappings
+        match as 'APPLICATION COMPONENT NAME'. Returns the previous value.
+        """
+        previous = self.workload_class
+        if workload_class != previous:
+            self.connection.setclientinfo("APPLICATIONCOMPONENT", workload_class or "")
+            self.workload_class = workload_class
+        return previous
+
+    def reset_session(self, schema: str) -> List[str]:
+        """
+        Switches back to the ``schema`` the session was opened with and unsets
+        every session variable, including client info, except for the client
+        info the adapter manages itself. DBT_NODE_ID is cleared and the
+        workload class has to be set again by the caller. Returns the names of
+        the unset variables.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute('SET SCHEMA "{}"'.format(schema.replace('"', '""')))
+            cursor.execute(
+                "SELECT KEY FROM M_SESSION_CONTEXT "
+                "WHERE CONNECTION_ID = CURRENT_CONNECTION AND SECTION = 'USER'"
+            )
+            keys = [row[0] for row in cursor.fetchall() if row[0] not in SESSION_CLIENT_INFO]
+            for key in keys:
+                cursor.execute("UNSET '{}'".format(key.replace("'", "''")))
+        finally:
+            cursor.close()
+        self.session_variables.clear()
+        self.tag_node(None)
+        return keys
+
+    def close_cursors(self) -> int:
+        closed = len(self.open_cursors)
+        while self.open_cursors:
+            self.open_cursors.pop().close()
+        return closed
+
+    def close(self):
+        try:
+            self.close_cursors()
+            self.statements.clear()
+        finally:
+            self.connection.close()
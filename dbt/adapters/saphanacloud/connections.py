@@ -5,18 +5,30 @@ from dbt.adapters.sql import SQLConnectionManager
 from dbt.exceptions import DbtRuntimeError
 from hdbcli import dbapi  # Importing the correct library for SAP HANA
 from dbt.adapters.events.logging import AdapterLogger
-from time import time
-from typing import Optional, Any, Tuple
-from dbt.adapters.saphanacloud.connection_helper import SapHanaCloudConnection
+from time import perf_counter
+from typing import Optional, Any, Dict, Iterator, List, Tuple
+from dbt.adapters.saphanacloud.connection_helper import SapHanaCloudConnection, SapHanaCloudHandle
+from dbt.adapters.saphanacloud.pool import POOL
+from dbt.adapters.saphanacloud.results import ColumnarResult, chunk_size_of, fetch_columnar, iter_columnar
 from dbt_common.events.functions import fire_event
 from dbt.adapters.events.types import ConnectionUsed, SQLQuery, SQLQueryStatus
 from dbt_common.events.contextvars import get_node_info
 from dbt_common.utils import cast_to_str
+from dbt_common.clients.agate_helper import empty_table
+import agate
+import getpass
+import hashlib
 import os
+import threading
 import json
 
 logger = AdapterLogger("saphanacloud")
 
+
+def _quote_literal(value: str) -> str:
+    # Escapes a value for use inside a single quoted SQL string literal
+    return value.replace("'", "''")
+
 DATATYPES = {
     0: "NULL",
     1: "TINYINT",
@@ -94,6 +106,23 @@ DATATYPES = {
 }
 
 
+def _os_user() -> str:
+    try:
+        return getpass.getuser()
+    except Exception:
+        return ""
+
+
+@dataclass
+class SapHanaCloudAdapterResponse(AdapterResponse):
+    # Wall time of the statement on the client, including fetching its result
+    execution_time: Optional[float] = None
+    # Server figures reported by hdbcli, times in seconds, memory in bytes
+    server_processing_time: Optional[float] = None
+    server_cpu_time: Optional[float] = None
+    server_memory_usage: Optional[int] = None
+
+
 @dataclass
 class SapHanaCloudCredentials(Credentials):
     database: str
@@ -103,7 +132,33 @@ class SapHanaCloudCredentials(Credentials):
     password: Optional[str] = None
     schema: Optional[str] = None
     cf_service_name: Optional[str] = None
+    # Seconds, forwarded to the driver as connectTimeout in milliseconds
     connect_timeout: int = 10
+    # Network options forwarded to hdbcli, None keeps the driver default
+    compress: Optional[bool] = None
+    packet_size: Optional[int] = None
+    prefetch: Optional[bool] = None
+    communication_timeout: Optional[int] = None
+    # Rows fetched per round trip by each cursor
+    arraysize: Optional[int] = None
+    # Prepared statements kept per connection for parameterized queries
+    statement_cache_size: int = 32
+    # A warning is logged when a connection has more cursors open at once
+    max_open_cursors: int = 50
+    # Reported as APPLICATION in the session's client info
+    application: str = "dbt"
+    # Workload class of sessions which run no model with its own one, applied
+    # through a WORKLOAD MAPPING on the APPLICATIONCOMPONENT client info
+    workload_class: Optional[str] = None
+    # Connections kept open per credentials for reuse, 0 disables the pool
+    pool_size: int = 0
+    pool_idle_timeout: int = 300
+    # Pooled connections idle for longer are probed before they are reused
+    pool_validate_after: int = 60
+    # Open a connection per thread concurrently when the run starts
+    warmup_connections: bool = False
+    # Read the columns of all existing model relations when the run starts
+    prefetch_columns: bool = False
 
     def __post_init__(self) -> None:
 
@@ -134,7 +189,12 @@ class SapHanaCloudCredentials(Credentials):
         if None in [self.schema, self.user, self.password, self.host, self.port]:
             raise DbtRuntimeError("One or more required credentials are None")
 
-    _ALIASES = {"dbname": "database", "pass": "password"}
+    _ALIASES = {
+        "dbname": "database",
+        "pass": "password",
+        "packetSize": "packet_size",
+        "communicationTimeout": "communication_timeout",
+    }
 
     @property
     def type(self):
@@ -152,6 +212,40 @@ class SapHanaCloudCredentials(Credentials):
             "database",
             "schema",
             "connect_timeout",
+            "compress",
+            "packet_size",
+            "prefetch",
+            "communication_timeout",
+            "arraysize",
+            "pool_size",
+        )
+
+    def driver_options(self) -> Dict[str, Any]:
+        """Connect properties passed to ``dbapi.connect`` besides the address and login."""
+        options = {
+            "connectTimeout": self.connect_timeout * 1000,
+            "compress": self.compress,
+            "packetSize": self.packet_size,
+            "prefetch": self.prefetch,
+            "communicationTimeout": self.communication_timeout,
+        }
+        return {
+            name: str(value).lower() if isinstance(value, bool) else value
+            for name, value in options.items()
+            if value is not None
+        }
+
+    def pool_key(self) -> Tuple[Any, ...]:
+        """
+        Every credential which shapes a connection. Profiles only differing in
+        their password or Cloud Foundry service never share pooled sessions.
+        """
+        password = hashlib.sha256((self.password or "").encode("utf-8")).hexdigest()
+        return tuple(getattr(self, key) for key in self._connection_keys()) + (
+            password,
+            self.cf_service_name,
+            self.application,
+            self.statement_cache_size,
         )
 
 
@@ -161,6 +255,34 @@ class SapHanaCloudConnectionManager(SQLConnectionManager):
     def __init__(self, profile, connections):
         super().__init__(profile, connections)
         self.in_auto_commit_mode = True
+        self._warm_up_lock = threading.Lock()
+        self._warmed_up = False
+
+    def set_connection_name(self, name: Optional[str] = None):
+        self._warm_up()
+        return super().set_connection_name(name)
+
+    def _warm_up(self) -> None:
+        """
+        With ``warmup_connections``, opens the connections of the other
+        threads in the background once the first connection is needed, so
+        commands which never connect, like parse or ls, don't either. Only
+        as many connections are opened as the pool is missing for one per
+        thread, capped at ``pool_size`` when pooling is enabled.
+        """
+        credentials = self.profile.credentials
+        if not credentials.warmup_connections or self._warmed_up:
+            return
+        with self._warm_up_lock:
+            if self._warmed_up:
+                return
+            self._warmed_up = True
+            size = self.profile.threads
+            if credentials.pool_size > 0:
+                size = min(size, credentials.pool_size)
+            started = POOL.warm_up(credentials.pool_key(), lambda: self._connect(credentials), size)
+            if started:
+                logger.debug(f"Warming up {started} connections")
 
     def begin(self):
         pass
@@ -177,16 +299,87 @@ class SapHanaCloudConnectionManager(SQLConnectionManager):
         if limit:
             sql = f"{sql} LIMIT {limit}"
 
-        # Execute the query with the possibility of fetching results
-        return super().execute(sql, auto_begin, fetch=fetch)
+        # Execute the query with the possibility of fetching results. The
+        # cursor is closed as soon as the result has been read, which frees
+        # its result set on the server.
+        sql = self._add_query_comment(sql)
+        start_time = perf_counter()
+        _, cursor = self.add_query(sql, auto_begin)
+        try:
+            response = self.get_response(cursor)
+            if fetch:
+                table = self.get_result_from_cursor(cursor, None)
+            else:
+                table = empty_table()
+            response.execution_time = round(perf_counter() - start_time, 3)
+            return response, table
+        finally:
+            self.release_cursor(cursor)
+
+    def iter_results(
+        self, sql: str, auto_begin: bool = False, chunk_size: Optional[int] = None
+    ) -> Iterator[ColumnarResult]:
+        """
+        Runs ``sql`` and yields its result one chunk of rows at a time, so
+        consumers never hold more than ``chunk_size`` rows in memory.
+        """
+        sql = self._add_query_comment(sql)
+        _, cursor = self.add_query(sql, auto_begin)
+        try:
+            if cursor.description is None:
+                return
+            yield from iter_columnar(
+                cursor, self._type_names(cursor), chunk_size or chunk_size_of(cursor))
+        finally:
+            self.release_cursor(cursor)
+
+    def set_workload_class(self, workload_class: Optional[str]) -> Optional[str]:
+        """
+        Maps the thread connection's session to ``workload_class``, or to the
+        profile's default when None. Returns the previous workload class.
+        """
+        connection = self.get_thread_connection()
+        if workload_class is None:
+            workload_class = connection.credentials.workload_class
+        previous = connection.handle.set_workload_class(workload_class)
+        logger.debug(f"Using workload class {workload_class} on '{connection.name}'")
+        return previous
+
+    def set_session_variables(self, variables: Dict[str, Any]) -> None:
+        """
+        Sets session variables on the thread connection until
+        ``unset_session_variables`` is called or the connection is released.
+        """
+        connection = self.get_thread_connection()
+        for key, value in variables.items():
+            self.execute("SET '{}' = '{}'".format(_quote_literal(key), _quote_literal(str(value))))
+            connection.handle.session_variables[key] = str(value)
+
+    def unset_session_variables(self) -> None:
+        connection = self.get_thread_connection()
+        for key in list(connection.handle.session_variables):
+            self.execute("UNSET '{}'".format(_quote_literal(key)))
+            del connection.handle.session_variables[key]
+
+    def release_cursor(self, cursor) -> None:
+        """Closes a cursor returned by ``add_query`` once its result is consumed."""
+        connection = self.get_thread_connection()
+        if isinstance(connection.handle, SapHanaCloudHandle):
+            connection.handle.close_cursor(cursor)
 
     def add_query(
         self,
         sql: str,
         auto_begin: bool = True,
         bindings: Optional[Any] = None,
-        abridge_sql_log: bool = False
+        abridge_sql_log: bool = False,
+        executemany: bool = False
     ) -> Tuple[SapHanaCloudConnection, Any]:
+        """
+        Runs a single statement on the thread connection. With ``executemany``
+        the bindings are a list of parameter rows which are sent to HANA in one
+        round trip via ``cursor.executemany``.
+        """
         connection = self.get_thread_connection()
         if auto_begin and not connection.transaction_open:
             self.begin()
@@ -200,11 +393,17 @@ class SapHanaCloudConnectionManager(SQLConnectionManager):
         )
 
         with self.exception_handler(sql):
+            self._tag_session(connection)
+
             if abridge_sql_log:
                 log_sql = f'{sql[:512]}...'
             else:
                 log_sql = sql
 
+            if executemany:
+                assert bindings is not None, "executemany requires bindings"
+                log_sql = f"{log_sql} -- batch of {len(bindings)} rows"
+
             fire_event(
                 SQLQuery(
                     conn_name=cast_to_str(connection.name),
@@ -213,20 +412,78 @@ class SapHanaCloudConnectionManager(SQLConnectionManager):
                 )
             )
 
-            start_time = time()
-            cursor = connection.handle.cursor()
-            cursor.execute(sql, bindings)
+            start_time = perf_counter()
+            statements = connection.handle.statements
+            if bindings and statements.size > 0:
+                # Parameterized statements are prepared once per connection
+                # and executed again with the new bindings
+                cursor = statements.get(sql, lambda: self._cursor(connection))
+                try:
+                    if executemany:
+                        cursor.executemanyprepared(bindings)
+                    else:
+                        cursor.executeprepared(bindings)
+                except dbapi.Error:
+                    statements.discard(sql)
+                    raise
+            else:
+                cursor = self._open_cursor(connection)
+                if executemany:
+                    cursor.executemany(sql, bindings)
+                else:
+                    cursor.execute(sql, bindings)
             fire_event(
                 SQLQueryStatus(
                     status=str(self.get_response(cursor)),
-                    elapsed=round((time() - start_time)),
+                    elapsed=round(perf_counter() - start_time, 3),
                     node_info=get_node_info(),
                 )
             )
             return connection, cursor
 
     @classmethod
-    def get_response(cls, cursor) -> AdapterResponse:
+    def _tag_session(cls, connection) -> None:
+        node_id = get_node_info().get("unique_id")
+        if isinstance(connection.handle, SapHanaCloudHandle) and connection.handle.tag_node(node_id):
+            logger.debug(f"Tagged session of '{connection.name}' with DBT_NODE_ID={node_id}")
+
+    @classmethod
+    def _cursor(cls, connection):
+        cursor = connection.handle.cursor()
+        arraysize = connection.credentials.arraysize
+        if arraysize:
+            # arraysize is the fetchmany default, the fetch size is the number
+            # of rows the driver requests from the server per round trip
+            cursor.arraysize = arraysize
+            cursor.setfetchsize(arraysize)
+        return cursor
+
+    @classmethod
+    def _open_cursor(cls, connection):
+        """A cursor for a single statement, tracked until it is released."""
+        cursor = cls._cursor(connection)
+        open_cursors = connection.handle.track_cursor(cursor)
+        if open_cursors == connection.credentials.max_open_cursors + 1:
+            logger.warning(
+                f"Connection '{connection.name}' has more than "
+                f"{connection.credentials.max_open_cursors} cursors open")
+        return cursor
+
+    @classmethod
+    def get_result_from_cursor(cls, cursor: Any, limit: Optional[int]) -> agate.Table:
+        # Rows are read in chunks into typed column buffers, which also give
+        # the agate column types without testing every value
+        if cursor.description is None:
+            return empty_table()
+        result = fetch_columnar(cursor, cls._type_names(cursor), chunk_size_of(cursor), limit)
+        return result.to_agate()
+
+    @staticmethod
+    def _type_names(cursor) -> List[Optional[str]]:
+        return [DATATYPES.get(column[1]) for column in cursor.description]
+
+    @classmethod
+    def get_response(cls, cursor) -> SapHanaCloudAdapterResponse:
         # Customize this method to extract meaningful information from the SAP HANA cursor
         num_rows = 0
         activity = "success"
@@ -241,12 +498,25 @@ class SapHanaCloudConnectionManager(SQLConnectionManager):
             activity = "error"
             message = f"An error occurred: {str(e)}"
 
-        return AdapterResponse(
+        return SapHanaCloudAdapterResponse(
             _message=message,
             rows_affected=num_rows,
-            code=activity
+            code=activity,
+            **cls._server_metrics(cursor)
         )
 
+    @staticmethod
+    def _server_metrics(cursor) -> Dict[str, Any]:
+        # hdbcli reports the times in microseconds
+        try:
+            return {
+                "server_processing_time": cursor.server_processing_time() / 1e6,
+                "server_cpu_time": cursor.server_cpu_time() / 1e6,
+                "server_memory_usage": cursor.server_memory_usage(),
+            }
+        except (AttributeError, dbapi.Error):
+            return {}
+
     @contextmanager
     def exception_handler(self, sql: str):
         try:
@@ -270,26 +540,16 @@ class SapHanaCloudConnectionManager(SQLConnectionManager):
         credentials = connection.credentials
 
         try:
-            handle = dbapi.connect(
-                address=credentials.host,
-                port=credentials.port,
-                user=credentials.user,
-                password=credentials.password,
-                schema=credentials.schema
-            )
-
-            connection.handle = handle  # Set the connection handle
-
-            cursor = connection.handle.cursor()
-            try:
-                logger.debug("Testing connection with 'SELECT 1 FROM DUMMY'")
-                cursor.execute("SELECT 1 FROM DUMMY")
-                connection.state = 'open'
-                logger.debug("Connection successful")
-            except Exception as exc:
-                logger.error(f"Failed during connection test: {exc}")
-                raise DbtRuntimeError("Connection test failed") from exc
-            logger.debug("Connection successful finally")
+            handle = cls._get_pooled_handle(connection)
+            if handle is None:
+                handle = cls._connect(credentials)
+
+            # A fresh connection has just been authenticated by the server
+            # and pooled ones are validated when taken from the pool, so
+            # there is no need for a probe query here
+            connection.handle = handle
+            connection.state = 'open'
+            logger.debug("Connection successful")
             return connection
 
         except Exception as exc:
@@ -298,18 +558,134 @@ class SapHanaCloudConnectionManager(SQLConnectionManager):
             connection.handle = None
             raise DbtRuntimeError(str(exc)) from exc
 
+    @classmethod
+    def _connect(cls, credentials):
+        handle = dbapi.connect(
+            address=credentials.host,
+            port=credentials.port,
+            user=credentials.user,
+            password=credentials.password,
+            schema=credentials.schema,
+            **credentials.driver_options()
+        )
+        # Client info shows up in monitoring views such as M_CONNECTIONS,
+        # M_ACTIVE_STATEMENTS and M_EXPENSIVE_STATEMENTS
+        handle.setclientinfo("APPLICATION", credentials.application)
+        handle.setclientinfo("APPLICATIONUSER", _os_user())
+        handle = SapHanaCloudHandle(handle, credentials.statement_cache_size)
+        handle.set_workload_class(credentials.workload_class)
+        return handle
+
+    @classmethod
+    def _get_pooled_handle(cls, connection):
+        """
+        Takes an idle connection opened with the same credentials from the
+        process-wide pool, if pooling or warm-up is enabled and one is still
+        connected.
+        """
+        credentials = connection.credentials
+        if credentials.pool_size <= 0 and not credentials.warmup_connections:
+            return None
+
+        while True:
+            pooled = POOL.acquire(
+                credentials.pool_key(), credentials.pool_idle_timeout, credentials.connect_timeout)
+            if pooled is None:
+                return None
+            handle, idle_seconds = pooled
+            if cls._is_alive(handle, validate=idle_seconds > credentials.pool_validate_after):
+                logger.debug(
+                    f"Reusing pooled connection for '{connection.name}', idle for {idle_seconds:.1f}s")
+                return handle
+            try:
+                handle.close()
+            except dbapi.Error:
+                pass
+
+    @classmethod
+    def _is_alive(cls, handle, validate: bool = False) -> bool:
+        """
+        ``isconnected()`` only reports the client side state of the
+        connection. With ``validate``, a probe query makes sure the server
+        still accepts statements on it.
+        """
+        try:
+            if not handle.isconnected():
+                return False
+            if validate:
+                cls._probe(handle)
+            return True
+        except dbapi.Error as exc:
+            logger.debug(f"Connection is no longer alive: {exc}")
+            return False
+
+    @staticmethod
+    def _probe(handle) -> None:
+        cursor = handle.cursor()
+        try:
+            cursor.execute("SELECT 1 FROM DUMMY")
+        finally:
+            cursor.close()
+
+    @classmethod
+    def _close_handle(cls, connection):
+        if not isinstance(connection.handle, SapHanaCloudHandle):
+            return super()._close_handle(connection)
+
+        credentials = connection.credentials
+        left_open = connection.handle.close_cursors()
+        if left_open:
+            logger.debug(f"Closed {left_open} cursors left open on '{connection.name}'")
+        statements = connection.handle.statements
+        if statements.hits or statements.misses:
+            logger.debug(f"Prepared statement cache of '{connection.name}': {statements}")
+        if credentials.pool_size > 0 and cls._reset_session(connection):
+            if POOL.release(credentials.pool_key(), connection.handle, credentials.pool_size):
+                logger.debug(f"Returned connection '{connection.name}' to the pool")
+                return
+        super()._close_handle(connection)
+
+    @classmethod
+    def _reset_session(cls, connection) -> bool:
+        """
+        Undoes the session changes of the node which used the connection, so
+        it can be handed to another one. Returns False when the connection is
+        not fit to be pooled.
+        """
+        handle = connection.handle
+        try:
+            if not handle.isconnected():
+                return False
+            if not handle.getautocommit():
+                handle.rollback()
+                handle.setautocommit(True)
+            handle.reset_session(connection.credentials.schema)
+            handle.set_workload_class(connection.credentials.workload_class)
+            return True
+        except dbapi.Error as exc:
+            logger.debug(f"Not pooling connection '{connection.name}': {exc}")
+            return False
+
+    def cleanup_all(self) -> None:
+        super().cleanup_all()
+        credentials = self.profile.credentials
+        if credentials.pool_size > 0:
+            logger.debug(f"Connection pool stats: {POOL.stats()}")
+        elif credentials.warmup_connections:
+            # Without pooling, warmed up connections are not kept for later runs
+            POOL.discard(credentials.pool_key())
+
     @classmethod
     def check_connection(cls, connection):
-        logger.info("Overriding check_connection to use custom test.")
-        return cls.test_connection(connection)
+        if connection.handle is not None and cls._is_alive(connection.handle):
+            return True
+        raise DbtRuntimeError("Connection test failed")
 
     @classmethod
     def test_connection(cls, connection):
-        cursor = connection.handle.cursor()
         try:
-            logger.info("from test_connection")
-            cursor.execute("SELECT 1 FROM DUMMY")
-            logger.info("Connection test passed.")
+            cls._probe(connection.handle)
+            logger.debug("Connection test passed.")
             return True
         except Exception as exc:
             logger.error(f"Connection test failed: {exc}")
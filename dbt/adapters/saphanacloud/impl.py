@@ -1,24 +1,71 @@
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from decimal import Decimal
 from dbt.adapters.sql import SQLAdapter
 from dbt.adapters.saphanacloud import SapHanaCloudConnectionManager
 from dbt.adapters.saphanacloud.relation import SapHanaCloudRelation
 from dbt.adapters.base import AdapterConfig
 from dbt.adapters.base.relation import BaseRelation
+from dbt.adapters.base.column import Column as BaseColumn
 from dbt_common.contracts.constraints import ConstraintType, ColumnLevelConstraint, ModelLevelConstraint
 from dbt_common.dataclass_schema import ValidationError, dbtClassMixin
 from dbt.adapters.base import available
-from typing import Any, List, Dict, Optional, FrozenSet, Tuple, Set, Iterable
+from typing import Any, List, Dict, Optional, FrozenSet, Tuple, Set, Iterable, Iterator, Mapping, Union
 import agate
 from dbt_common.exceptions import MacroArgTypeError, CompilationError
 from dbt.adapters.base.impl import GET_CATALOG_RELATIONS_MACRO_NAME, ConstraintSupport
 from dbt.context.providers import generate_runtime_model_context
 from dbt.adapters.saphanacloud.column import SapHanaCloudColumn
+from dbt.adapters.saphanacloud.column_cache import ColumnCache
+from dbt.adapters.saphanacloud.results import ColumnarResult
+from dbt.adapters.saphanacloud.seed import SeedFile, infer_number_type, infer_text_type, seed_file_hash, widen_type
 from dbt.adapters.exceptions import IndexConfigError, IndexConfigNotDictError
 from dbt_common.utils import encoding as dbt_encoding
 from dbt.adapters.contracts.relation import RelationConfig
 from dbt.adapters.capability import CapabilityDict, CapabilitySupport, Support, Capability
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from random import sample
+from time import perf_counter
+from dbt.adapters.events.logging import AdapterLogger
+from dbt.exceptions import DbtRuntimeError
+from dbt.flags import get_flags
+
+logger = AdapterLogger("saphanacloud")
+
+# Schemas listed by a single metadata query when populating the relation cache
+LIST_RELATIONS_CHUNK_SIZE = 200
+
+# Cached relations compared against the database at the end of a debug run
+CACHE_CHECK_SAMPLE_SIZE = 50
+
+
+def _statement_limits(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    The session settings which cap the memory (in GB) and threads of every
+    statement of the node, from its ``statement_memory_limit`` and
+    ``statement_thread_limit`` configs.
+    """
+    limits: Dict[str, Any] = {}
+
+    memory_limit = config.get("statement_memory_limit")
+    if memory_limit is not None:
+        if isinstance(memory_limit, bool) or not isinstance(memory_limit, (int, float)) or memory_limit <= 0:
+            raise CompilationError(
+                f"`statement_memory_limit` must be a positive number of GB, got: {memory_limit}")
+        limits["STATEMENT MEMORY LIMIT"] = memory_limit
+
+    thread_limit = config.get("statement_thread_limit")
+    if thread_limit is not None:
+        if isinstance(thread_limit, bool) or not isinstance(thread_limit, int) or thread_limit < 1:
+            raise CompilationError(
+                f"`statement_thread_limit` must be a positive integer, got: {thread_limit}")
+        limits["STATEMENT THREAD LIMIT"] = thread_limit
+
+    return limits
 
 
 @dataclass
@@ -55,6 +102,22 @@ class SapHanaCloudIndexConfig(dbtClassMixin):
 class SapHanaCloudConfig(AdapterConfig):
     unlogged: Optional[bool] = None
     indexes: Optional[List[SapHanaCloudIndexConfig]] = None
+    batch_size: Optional[int] = None
+    streaming: Optional[bool] = None
+    skip_unchanged: Optional[bool] = None
+    load_strategy: Optional[str] = None
+    load_threads: Optional[int] = None
+    # Sent as the APPLICATIONCOMPONENT client info. It only takes effect
+    # through a WORKLOAD MAPPING on 'APPLICATION COMPONENT NAME' which maps
+    # the value to the workload class of the same name
+    workload_class: Optional[str] = None
+    statement_memory_limit: Optional[float] = None
+    statement_thread_limit: Optional[int] = None
+    hints: Optional[Union[str, List[str]]] = None
+    delta_merge: Optional[str] = None
+    delta_merge_threshold: Optional[int] = None
+    optimize_compression: Optional[bool] = None
+    optimize_compression_threshold: Optional[int] = None
 
 
 class SapHanaCloudAdapter(SQLAdapter):
@@ -80,6 +143,10 @@ class SapHanaCloudAdapter(SQLAdapter):
             support=Support.Full)}
     )
 
+    def __init__(self, config, mp_context) -> None:
+        super().__init__(config, mp_context)
+        self.column_cache = ColumnCache()
+
     def add_query(self, sql, auto_begin=True, bindings=None, abridge_sql_log=False):
 
         # Ensure BEGIN is not used explicitly, as it is not required in HANA
@@ -93,6 +160,175 @@ class SapHanaCloudAdapter(SQLAdapter):
 
         return rel1
 
+    def pre_model_hook(self, config: Mapping[str, Any]) -> Optional[str]:
+        # The node's statements run in its workload class and with its
+        # statement limits, post_model_hook restores the session even when
+        # the node fails
+        limits = _statement_limits(config)
+        previous = None
+        workload_class = config.get("workload_class")
+        try:
+            if workload_class is not None:
+                previous = self.connections.set_workload_class(workload_class)
+            if limits:
+                self.connections.set_session_variables(limits)
+        except Exception:
+            # dbt skips post_model_hook when this hook fails, so the session
+            # is restored here before the error is raised
+            self.post_model_hook(config, previous)
+            raise
+        return previous
+
+    def post_model_hook(self, config: Mapping[str, Any], context: Optional[str]) -> None:
+        if config.get("workload_class") is not None:
+            self.connections.set_workload_class(context)
+        try:
+            self.connections.unset_session_variables()
+        except DbtRuntimeError as exc:
+            # A broken connection is closed instead of being pooled, which
+            # ends the session along with its variables
+            logger.debug(f"Could not unset session variables: {exc}")
+
+    @available
+    def add_batch_query(self, sql: str, bindings: List[Any]):
+        """
+        Executes a parameterized statement once for every row in ``bindings``
+        using a single ``executemany`` round trip.
+        """
+        start_time = perf_counter()
+        _, cursor = self.connections.add_query(
+            sql, auto_begin=False, bindings=bindings, executemany=True)
+        try:
+            response = self.connections.get_response(cursor)
+            response.execution_time = round(perf_counter() - start_time, 3)
+            return response
+        finally:
+            self.connections.release_cursor(cursor)
+
+    @available
+    def iter_query_results(self, sql: str, chunk_size: Optional[int] = None) -> Iterator[ColumnarResult]:
+        """
+        Runs ``sql`` and yields its result in chunks of ``chunk_size`` rows,
+        each held column by column. Call ``to_agate()`` on a chunk when an
+        agate table is needed.
+        """
+        return self.connections.iter_results(sql, chunk_size=chunk_size)
+
+    @available
+    def get_seed_file(self, model: Dict[str, Any], chunk_size: int) -> SeedFile:
+        """
+        Opens the seed's CSV file for streaming and infers its column types in
+        a first pass over the file, holding one chunk of rows at a time.
+        """
+        config = model["config"]
+        seed_file = SeedFile(
+            self._get_seed_path(model),
+            text_columns=(config.get("column_types") or {}).keys(),
+            delimiter=config.get("delimiter") or ",",
+            chunk_size=chunk_size,
+        )
+        return seed_file.profile()
+
+    @available
+    def get_seed_hash(self, model: Dict[str, Any]) -> str:
+        """
+        Content hash of the seed's CSV file together with the config which
+        shapes the loaded table, used to skip reloading unchanged seeds.
+        """
+        config = model["config"]
+        return seed_file_hash(self._get_seed_path(model), {
+            "column_types": config.get("column_types"),
+            "delimiter": config.get("delimiter"),
+            "quote_columns": config.get("quote_columns"),
+        })
+
+    @available
+    def get_seed_column_changes(
+        self, dest_columns: List[BaseColumn], staging_columns: List[BaseColumn]
+    ) -> Optional[List[Dict[str, str]]]:
+        """
+        The columns of an existing seed table which have to be widened to hold
+        the freshly staged rows, as ``{'name': ..., 'data_type': ...}`` dicts.
+        None when the columns were renamed, added or removed, or a column's
+        type can't be widened, the table has to be recreated then.
+        """
+        if [column.name for column in dest_columns] != [column.name for column in staging_columns]:
+            return None
+
+        changes = []
+        for dest, staging in zip(dest_columns, staging_columns):
+            current = (dest.dtype.upper(), dest.char_size, dest.numeric_scale)
+            data_type = widen_type(current, (staging.dtype.upper(), staging.char_size, staging.numeric_scale))
+            if data_type is None:
+                return None
+            if data_type != widen_type(current, current):
+                changes.append({"name": dest.name, "data_type": data_type})
+        return changes
+
+    @staticmethod
+    def _get_seed_path(model: Dict[str, Any]) -> str:
+        return os.path.join(model["root_path"], model["original_file_path"])
+
+    @available
+    def load_seed_file(self, sql: str, seed_file: SeedFile, threads: int = 1) -> int:
+        """
+        Streams the rows of ``seed_file`` into the parameterized insert ``sql``,
+        one ``executemany`` batch per chunk. Returns the number of rows loaded.
+        """
+        return self.load_seed_batches(sql, seed_file.iter_batches(), threads)
+
+    @available
+    def load_seed_batches(self, sql: str, batches: Iterable[List[Any]], threads: int = 1) -> int:
+        """
+        Inserts every batch of rows (agate rows or tuples) with
+        ``add_batch_query`` and returns the number of rows HANA reports as
+        inserted. With more than one thread, each thread opens its
+        own connection and pulls the next batch until ``batches`` is exhausted,
+        so a single seed is loaded over ``threads`` connections in parallel.
+        """
+        batches = iter(batches)
+        if threads <= 1:
+            rows_loaded = 0
+            for batch in batches:
+                rows_loaded += self._load_batch(sql, batch)
+            return rows_loaded
+
+        lock = threading.Lock()
+        failed = threading.Event()
+
+        def next_batch():
+            with lock:
+                if failed.is_set():
+                    return None
+                return next(batches, None)
+
+        def load(connection_name: str) -> int:
+            rows_loaded = 0
+            with self.connection_named(connection_name):
+                while True:
+                    batch = next_batch()
+                    if batch is None:
+                        return rows_loaded
+                    try:
+                        rows_loaded += self._load_batch(sql, batch)
+                    except Exception:
+                        # Stop the other threads from picking up more batches
+                        failed.set()
+                        raise
+
+        name = self.connections.get_thread_connection().name
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [
+                executor.submit(copy_context().run, load, f"{name}_load_{i}")
+                for i in range(threads)
+            ]
+            return sum(future.result() for future in futures)
+
+    def _load_batch(self, sql: str, batch: List[Any]) -> int:
+        response = self.add_batch_query(sql, [tuple(row) for row in batch])
+        # The driver reports -1 when it doesn't know the row count
+        return response.rows_affected if response.rows_affected >= 0 else len(batch)
+
     def debug_query(self) -> None:
         self.execute("SELECT 1 FROM DUMMY")
 
@@ -100,29 +336,41 @@ class SapHanaCloudAdapter(SQLAdapter):
     def date_function(cls):
         return 'CURRENT_DATE'
 
-    def convert_boolean_type(self, value):
+    @classmethod
+    def convert_boolean_type(cls, agate_table: agate.Table, col_idx: int) -> str:
         return 'BOOLEAN'
 
-    def convert_date_type(self, value):
+    @classmethod
+    def convert_date_type(cls, agate_table: agate.Table, col_idx: int) -> str:
         return 'DATE'
 
-    def convert_datetime_type(self, value):
+    @classmethod
+    def convert_datetime_type(cls, agate_table: agate.Table, col_idx: int) -> str:
         return 'TIMESTAMP'
 
     @classmethod
-    def convert_number_type(cls, agate_table, col_idx):
-        decimals = agate_table.aggregate(agate.MaxPrecision(col_idx))
-        return "FLOAT" if decimals else "INTEGER"
+    def convert_integer_type(cls, agate_table: agate.Table, col_idx: int) -> str:
+        return infer_number_type(
+            None if value is None else Decimal(value)
+            for value in agate_table.columns[col_idx].values()
+        )
+
+    @classmethod
+    def convert_number_type(cls, agate_table: agate.Table, col_idx: int) -> str:
+        return infer_number_type(agate_table.columns[col_idx].values())
 
-    def convert_text_type(self, value):
-        return 'VARCHAR'
+    @classmethod
+    def convert_text_type(cls, agate_table: agate.Table, col_idx: int) -> str:
+        return infer_text_type(agate_table.columns[col_idx].values())
 
-    def convert_time_type(self, value):
+    @classmethod
+    def convert_time_type(cls, agate_table: agate.Table, col_idx: int) -> str:
         return 'TIME'
 
     def alter_column_type(self, relation, column_name, new_column_type) -> None:
         self.execute_macro("saphanacloud__alter_column_type", kwargs={
                            "relation": relation, "column_name": column_name, "new_column_type": new_column_type})
+        self.column_cache.invalidate(relation)
 
     def check_schema_exists(self, schema_name: str) -> bool:
         results = self.execute_macro("saphanacloud__check_schema_exists", kwargs={
@@ -135,8 +383,10 @@ class SapHanaCloudAdapter(SQLAdapter):
                            kwargs={"schema_name": schema_name})
 
     def drop_relation(self, relation: BaseRelation):
+        # Only forget the relation once it is really gone
         self.execute_macro("saphanacloud__drop_relation",
                            kwargs={"relation": relation})
+        self.cache_dropped(relation)
 
     def drop_schema(self, relation: BaseRelation):
         relations = self.list_relations(
@@ -148,6 +398,7 @@ class SapHanaCloudAdapter(SQLAdapter):
             self.drop_relation(rel)
 
         super().drop_schema(relation)
+        self.column_cache.invalidate_schema(relation.schema)
 
     def expand_column_types(self, from_relation: BaseRelation, to_relation: BaseRelation) -> None:
         pass
@@ -157,15 +408,49 @@ class SapHanaCloudAdapter(SQLAdapter):
         return SapHanaCloudIndexConfig.parse(raw_index)
 
     def get_columns_in_relation(self, relation: SapHanaCloudRelation):
+        columns = self.column_cache.get(relation)
+        if columns is not None:
+            return columns
+
         results = self.execute_macro(
             "saphanacloud__get_columns_in_relation", kwargs={"relation": relation})
         # Ensure results are not None
         if results:
-            # `results` is an `agate.MappedSequence`, so we need to extract the values from the columns
+            # Relations that don't exist yet aren't cached
+            self.column_cache.put(relation, results)
             return results
         else:
             return []
 
+    @available
+    def invalidate_columns(self, relation: BaseRelation) -> str:
+        """Drops the relation's cached columns, called after DDL changing them."""
+        self.column_cache.invalidate(relation)
+        return ""
+
+    @available
+    def cache_added(self, relation: Optional[BaseRelation]) -> str:
+        super().cache_added(relation)
+        self.column_cache.invalidate(relation)
+        return ""
+
+    @available
+    def cache_dropped(self, relation: Optional[BaseRelation]) -> str:
+        super().cache_dropped(relation)
+        self.column_cache.invalidate(relation)
+        return ""
+
+    @available
+    def cache_renamed(
+        self,
+        from_relation: Optional[BaseRelation],
+        to_relation: Optional[BaseRelation],
+    ) -> str:
+        super().cache_renamed(from_relation, to_relation)
+        self.column_cache.invalidate(from_relation)
+        self.column_cache.invalidate(to_relation)
+        return ""
+
     def timestamp_add_sql(
         self, add_to: str, number: int = 1, interval: str = 'hour'
     ) -> str:
@@ -243,13 +528,185 @@ class SapHanaCloudAdapter(SQLAdapter):
         return catalogs, exceptions
 
     def list_relations_without_caching(self, relation: SapHanaCloudRelation):
-        # Pass both the database and schema names to the macro
-        results = self.execute_macro(
-            "saphanacloud__list_relations_without_caching",
-            kwargs={"database_name": relation.database,
-                    "schema_name": relation.schema}
+        return self._list_relations_in_schemas([relation])
+
+    def _list_relations_in_schemas(self, schema_relations: Iterable[BaseRelation]) -> List[BaseRelation]:
+        """
+        Lists the tables and views of all ``schema_relations`` with one
+        metadata query per chunk of ``LIST_RELATIONS_CHUNK_SIZE`` schemas.
+        """
+        # Schemas keep the exact name they have in the database, so quoted
+        # lower case schemas are rendered correctly when listed relations are
+        # dropped or compared with the cache
+        schemas: Dict[str, str] = {}
+        for relation in schema_relations:
+            if relation.schema:
+                schema = relation.schema.replace('"', '')
+                schemas[schema] = (relation.database or '').replace('"', '').upper()
+
+        names = list(schemas)
+        relations = []
+        for start in range(0, len(names), LIST_RELATIONS_CHUNK_SIZE):
+            chunk = names[start:start + LIST_RELATIONS_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            sql = (
+                "SELECT SCHEMA_NAME, CAST(TABLE_NAME AS VARCHAR), 'table' FROM SYS.TABLES "
+                f"WHERE SCHEMA_NAME IN ({placeholders}) "
+                "UNION ALL "
+                "SELECT SCHEMA_NAME, CAST(VIEW_NAME AS VARCHAR), 'view' FROM SYS.VIEWS "
+                f"WHERE SCHEMA_NAME IN ({placeholders})"
+            )
+            _, cursor = self.connections.add_query(sql, auto_begin=False, bindings=chunk + chunk)
+            try:
+                rows = cursor.fetchall()
+            finally:
+                self.connections.release_cursor(cursor)
+
+            for schema_name, identifier, relation_type in rows:
+                relations.append(self.Relation.create(
+                    database=schemas[schema_name],
+                    schema=schema_name,
+                    identifier=identifier,
+                    type=relation_type,
+                ))
+        return relations
+
+    def _relations_cache_for_schemas(
+        self,
+        relation_configs: Iterable[RelationConfig],
+        cache_schemas: Optional[Set[BaseRelation]] = None,
+    ) -> None:
+        # All schemas are listed in batched queries on the current connection
+        # instead of one query per schema
+        if not cache_schemas:
+            cache_schemas = self._get_cache_schemas(relation_configs)
+        for relation in self._list_relations_in_schemas(cache_schemas):
+            self.cache.add(relation)
+        self.cache.update_schemas({
+            (relation.database, relation.schema)
+            for relation in cache_schemas if relation.schema
+        })
+        if self.config.credentials.prefetch_columns:
+            self._prefetch_columns(relation_configs)
+
+    def _prefetch_columns(self, relation_configs: Iterable[RelationConfig]) -> None:
+        """
+        Reads the columns of the nodes' relations which are in the relation
+        cache into the column cache, with one metadata query per chunk of
+        ``LIST_RELATIONS_CHUNK_SIZE`` relations.
+        """
+        relations = {}
+        for relation_config in relation_configs:
+            target = self.Relation.create_from(quoting=self.config, relation_config=relation_config)
+            if not target.schema or not target.identifier or (target.database, target.schema) not in self.cache:
+                continue
+            # Only the object with exactly the node's name, differently cased
+            # objects in the same schema are other tables
+            identifier = target.identifier.replace('"', '')
+            for cached in self.cache.get_relations(target.database, target.schema):
+                if cached.identifier == identifier:
+                    relations[(target.schema.replace('"', ''), identifier)] = target
+
+        wanted = list(relations)
+        fetched = 0
+        for start in range(0, len(wanted), LIST_RELATIONS_CHUNK_SIZE):
+            chunk = wanted[start:start + LIST_RELATIONS_CHUNK_SIZE]
+            schemas = list(dict.fromkeys(schema for schema, _ in chunk))
+            names = list(dict.fromkeys(name for _, name in chunk))
+            schema_placeholders = ", ".join("?" for _ in schemas)
+            name_placeholders = ", ".join("?" for _ in names)
+            # Same columns as saphanacloud__get_columns_in_relation
+            columns_sql = (
+                "SELECT SCHEMA_NAME, {name}, COLUMN_NAME, DATA_TYPE_NAME, LENGTH, "
+                "CASE WHEN DATA_TYPE_NAME LIKE '%NUMERIC%' THEN LENGTH ELSE NULL END, "
+                "SCALE, POSITION FROM SYS.{table} "
+                f"WHERE SCHEMA_NAME IN ({schema_placeholders}) AND {{name}} IN ({name_placeholders})"
+            )
+            sql = (
+                columns_sql.format(name="TABLE_NAME", table="TABLE_COLUMNS")
+                + " UNION ALL "
+                + columns_sql.format(name="VIEW_NAME", table="VIEW_COLUMNS")
+                + " ORDER BY 1, 2, 8"
+            )
+            _, cursor = self.connections.add_query(
+                sql, auto_begin=False, bindings=(schemas + names) * 2
+            )
+            try:
+                rows = cursor.fetchall()
+            finally:
+                self.connections.release_cursor(cursor)
+
+            # SCHEMA_NAME IN and TABLE_NAME IN also match names from other schemas
+            columns: Dict[Tuple[str, str], List[Any]] = {}
+            for schema, name, *column in rows:
+                if (schema, name) in relations:
+                    columns.setdefault((schema, name), []).append(self.Column(*column[:5]))
+            for key, relation_columns in columns.items():
+                self.column_cache.put(relations[key], relation_columns)
+            fetched += len(columns)
+
+        logger.debug(f"Prefetched the columns of {fetched} relations into the column cache")
+
+    def check_relation_cache(self, sample_size: int = CACHE_CHECK_SAMPLE_SIZE) -> List[str]:
+        """
+        Compares a sample of the cached relations with SYS.TABLES and SYS.VIEWS
+        and logs every relation the cache and the database disagree on.
+        Relations of the sampled schemas which exist but aren't cached are
+        reported as well. Returns the mismatches.
+        """
+        with self.cache.lock:
+            cached = [cached.inner for cached in self.cache.relations.values()]
+        cached = sample(cached, min(sample_size, len(cached)))
+        schemas = {(relation.database, relation.schema): relation for relation in cached}
+
+        def key(relation):
+            # The names HANA keeps the relation under: quoted parts as they
+            # are, unquoted ones folded to upper case
+            policy = relation.quote_policy
+            schema = (relation.schema or '').replace('"', '')
+            identifier = (relation.identifier or '').replace('"', '')
+            return (
+                schema if policy.schema else schema.upper(),
+                identifier if policy.identifier else identifier.upper(),
+            )
+
+        existing = {key(relation): relation for relation in self._list_relations_in_schemas(schemas.values())}
+        mismatches = []
+        for relation in cached:
+            found = existing.get(key(relation))
+            if found is None:
+                mismatches.append(f"{relation} is cached but doesn't exist")
+            elif relation.type is not None and relation.type != found.type:
+                mismatches.append(f"{relation} is cached as a {relation.type} but is a {found.type}")
+        cached_keys = {
+            key(relation)
+            for database, schema in schemas
+            for relation in self.cache.get_relations(database, schema)
+        }
+        for relation_key, relation in existing.items():
+            if relation_key not in cached_keys:
+                mismatches.append(f"{relation} exists but isn't cached")
+
+        for mismatch in mismatches:
+            logger.warning(f"Relation cache mismatch: {mismatch}")
+        logger.debug(
+            f"Checked {len(cached)} cached relations in {len(schemas)} schemas, "
+            f"{len(mismatches)} mismatches"
         )
-        return results
+        return mismatches
+
+    def cleanup_connections(self) -> None:
+        # Runs with --debug verify the relation cache before closing up
+        if getattr(get_flags(), "DEBUG", False) and self.cache.relations:
+            try:
+                with self.connection_named("relation_cache_check"):
+                    self.check_relation_cache()
+            except Exception as exc:
+                logger.debug(f"Relation cache check failed: {exc}")
+        if self.column_cache.hits or self.column_cache.misses:
+            logger.debug(f"Column cache stats: {self.column_cache.stats()}")
+        self.column_cache.clear()
+        super().cleanup_connections()
 
     def list_schemas(self, database: str) -> List[str]:
         schemas = self.execute_macro("saphanacloud__list_schemas")
@@ -257,17 +714,7 @@ class SapHanaCloudAdapter(SQLAdapter):
         return rel2
 
     def populate_adapter_cache(self, adapter, required_schemas):
-        for schema in required_schemas:
-            relations = self.list_relations_without_caching(
-                BaseRelation.create(
-                    database=schema.database,
-                    schema=schema.schema,
-                    identifier=None,
-                )
-            )
-
-            for relation in relations:
-                adapter.cache.add(relation)
+        adapter._relations_cache_for_schemas([], set(required_schemas))
 
     def get_rows_different_sql(
         self,
@@ -331,6 +778,7 @@ class SapHanaCloudAdapter(SQLAdapter):
         return rendered_column_constraints
 
     def rename_relation(self, from_relation: BaseRelation, to_relation: BaseRelation):
+        self.cache_renamed(from_relation, to_relation)
         self.execute_macro("saphanacloud__rename_relation", kwargs={
                            "from_relation": from_relation, "to_relation": to_relation})
 
@@ -365,30 +813,54 @@ class SapHanaCloudAdapter(SQLAdapter):
         """
         Retrieves a relation (table or view) from the database.
 
+        When the schema is in the relation cache the relation is looked up
+        there, otherwise only this one object is queried from the database.
 
         :param database: The name of the database.
         :param schema: The name of the schema.
         :param identifier: The name of the table/view.
         :return: A Relation object if found, else None.
         """
-        try:
-            # Create a relation instance (dbt uses Relation objects to manage database entities)
-            relation = self.Relation.create(
-                database=database, schema=schema, identifier=identifier)
-
-            # Use adapter logic to fetch relation details
-            results = self.list_relations_without_caching(relation)
-
-            # Search for the relation in the results
-            for result in results:
+        if self._schema_is_cached(database, schema):
+            for result in self.cache.get_relations(database, schema):
                 if result.identifier.lower() == identifier.lower():
-
                     return result
+            return None
+
+        # A relation which doesn't exist is no error, the lookup returns None
+        # for it. Failing metadata queries are raised to the caller.
+        logger.debug(f"Schema {schema} is not cached, looking up {identifier} in the database")
+        return self._lookup_relation(database, schema, identifier)
+
+    def _lookup_relation(self, database: str, schema: str, identifier: str) -> Optional[BaseRelation]:
+        # Matches the identifier case-insensitively like the cache does
+        schema = schema.replace('"', '')
+        identifier = identifier.replace('"', '')
+        sql = (
+            "SELECT CAST(TABLE_NAME AS VARCHAR), 'table' FROM SYS.TABLES "
+            "WHERE SCHEMA_NAME = ? AND LOWER(TABLE_NAME) = LOWER(?) "
+            "UNION ALL "
+            "SELECT CAST(VIEW_NAME AS VARCHAR), 'view' FROM SYS.VIEWS "
+            "WHERE SCHEMA_NAME = ? AND LOWER(VIEW_NAME) = LOWER(?)"
+        )
+        _, cursor = self.connections.add_query(
+            sql, auto_begin=False, bindings=[schema, identifier, schema, identifier]
+        )
+        try:
+            rows = cursor.fetchall()
+        finally:
+            self.connections.release_cursor(cursor)
 
-        except Exception as e:
-            # Handle any exceptions if the table doesn't exist or another error occurs
-            print(f"Error fetching relation {identifier}: {str(e)}")
-        return None
+        if not rows:
+            return None
+        # Prefer the exact name when differently cased objects exist
+        name, relation_type = min(rows, key=lambda row: row[0] != identifier)
+        return self.Relation.create(
+            database=(database or '').replace('"', '').upper(),
+            schema=schema,
+            identifier=name,
+            type=relation_type,
+        )
 
     def get_timestamp_field(self, relation: SapHanaCloudRelation):
         results = self.execute_macro(
@@ -0,0 +1,155 @@
+import atexit
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+from dbt.adapters.events.logging import AdapterLogger
+from dbt.exceptions import DbtRuntimeError
+
+logger = AdapterLogger("saphanacloud")
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of idle hdbcli connections, keyed by the connection
+    keys of the credentials they were opened with. Connections closed by dbt
+    are kept here instead and reused by later dbt invocations in the same
+    process, e.g. when dbt is run repeatedly through ``dbtRunner``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle: Dict[Hashable, Deque[Tuple[Any, float]]] = {}
+        self._pending: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(
+        self, key: Hashable, idle_timeout: float, wait_timeout: float
+    ) -> Optional[Tuple[Any, float]]:
+        """
+        Returns the most recently released connection for ``key`` with the
+        seconds it has been idle, or None when the pool has none to offer.
+        Connections idle for longer than ``idle_timeout`` are closed. While
+        connections for ``key`` are still being warmed up, waits up to
+        ``wait_timeout`` seconds for them.
+        """
+        expired = []
+        found = None
+        deadline = monotonic() + wait_timeout
+        with self._available:
+            while True:
+                idle = self._idle.get(key)
+                now = monotonic()
+                while idle:
+                    handle, released_at = idle.pop()
+                    if now - released_at > idle_timeout:
+                        expired.append(handle)
+                        continue
+                    found = (handle, now - released_at)
+                    break
+                if found is not None or not self._pending.get(key):
+                    break
+                remaining = deadline - now
+                if remaining <= 0 or not self._available.wait(remaining):
+                    self.misses += 1
+                    raise DbtRuntimeError(
+                        f"Timed out after {wait_timeout}s waiting for connections "
+                        "being warmed up (warmup_connections)"
+                    )
+            self.evictions += len(expired)
+            if found is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        for handle in expired:
+            _close_quietly(handle)
+        return found
+
+    def release(self, key: Hashable, handle: Any, max_size: int) -> bool:
+        """
+        Puts ``handle`` back into the pool. Returns False when the pool for
+        ``key`` is full, the caller has to close the connection then.
+        """
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) >= max_size:
+                return False
+            idle.append((handle, monotonic()))
+            return True
+
+    def warm_up(self, key: Hashable, connect: Callable[[], Any], size: int) -> int:
+        """
+        Tops the idle connections for ``key`` up to ``size``, counting the
+        ones still being warmed up. The missing connections are opened
+        concurrently in the background and added to the pool as they become
+        ready. Returns the number of connections being opened.
+        """
+        with self._lock:
+            pending = self._pending.get(key, 0)
+            count = size - len(self._idle.get(key, ())) - pending
+            if count <= 0:
+                return 0
+            self._pending[key] = pending + count
+
+        def open_connection():
+            handle = None
+            try:
+                handle = connect()
+            except Exception as exc:
+                logger.debug(f"Connection warm-up failed: {exc}")
+            with self._available:
+                self._pending[key] -= 1
+                if handle is not None:
+                    self._idle.setdefault(key, deque()).append((handle, monotonic()))
+                self._available.notify_all()
+
+        executor = ThreadPoolExecutor(max_workers=count, thread_name_prefix="saphanacloud-warmup")
+        for _ in range(count):
+            executor.submit(open_connection)
+        executor.shutdown(wait=False)
+        return count
+
+    def discard(self, key: Hashable) -> None:
+        """Closes the idle connections for ``key``."""
+        with self._lock:
+            idle = self._idle.pop(key, ())
+        for handle, _ in idle:
+            _close_quietly(handle)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "idle": sum(len(idle) for idle in self._idle.values()),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            handles = [handle for idle in self._idle.values() for handle, _ in idle]
+            self._idle.clear()
+        for handle in handles:
+            _close_quietly(handle)
+
+
+def _close_quietly(handle: Any) -> None:
+    try:
+        handle.close()
+    except Exception as exc:
+        logger.debug(f"Error closing pooled connection: {exc}")
+
+
+POOL = ConnectionPool()
+atexit.register(POOL.clear)
+
+
+def get_pool_stats() -> Dict[str, int]:
+    """Hit, miss and eviction counters and the number of idle connections."""
+    return POOL.stats()
@@ -0,0 +1,205 @@
+from array import array
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import agate
+from dbt_common.clients.agate_helper import ISODateTime, Integer, Number
+
+# Rows fetched per round trip when the cursor's arraysize isn't configured
+DEFAULT_CHUNK_SIZE = 1000
+
+# Typed array codes per SAP HANA type: integers as 64 bit signed values,
+# floating point numbers as doubles and dates as their proleptic ordinal
+INTEGER_TYPES = frozenset((
+    "TINYINT", "SMALLINT", "INTEGER", "BIGINT",
+    "TINYINT_NOTNULL", "SMALLINT_NOTNULL", "INT_NOTNULL", "BIGINT_NOTNULL",
+))
+FLOAT_TYPES = frozenset(("REAL", "DOUBLE"))
+DATE_TYPES = frozenset(("DATE", "DAYDATE"))
+DECIMAL_TYPES = frozenset(("DECIMAL", "SMALLDECIMAL", "FIXEDPOINTDECIMAL", "FIXED16"))
+TIMESTAMP_TYPES = frozenset(("TIMESTAMP", "LONGDATE", "SECONDDATE"))
+TEXT_TYPES = frozenset((
+    "CHAR", "VARCHAR", "NCHAR", "NVARCHAR", "STRING", "NSTRING",
+    "VARCHAR2", "VARCHAR3", "NVARCHAR3", "SHORTTEXT", "FIXEDSTRING", "ALPHANUM",
+))
+
+
+def _fallback_types() -> List[agate.data_types.DataType]:
+    # Same types as dbt_common's default type tester, used for the columns
+    # whose agate type can't be told from their SAP HANA type
+    return [
+        Integer(null_values=("null", "")),
+        Number(null_values=("null", "")),
+        agate.data_types.Date(null_values=("null", ""), date_format="%Y-%m-%d"),
+        agate.data_types.DateTime(null_values=("null", ""), datetime_format="%Y-%m-%d %H:%M:%S"),
+        ISODateTime(null_values=("null", "")),
+        agate.data_types.Boolean(
+            true_values=("true",), false_values=("false",), null_values=("null", "")
+        ),
+        agate.data_types.Text(null_values=("null", "")),
+    ]
+
+
+class ResultColumn:
+    """
+    The values of one result column. Integer, floating point and date values
+    are kept in a typed array with a separate null mask, all other values in
+    a plain list.
+    """
+
+    def __init__(self, name: str, type_name: Optional[str]):
+        self.name = name
+        self.type_name = type_name
+        self.nulls: Optional[bytearray] = None
+        if type_name in INTEGER_TYPES:
+            self.values: Any = array("q")
+        elif type_name in FLOAT_TYPES:
+            self.values = array("d")
+        elif type_name in DATE_TYPES:
+            self.values = array("l")
+        else:
+            self.values = []
+        if isinstance(self.values, array):
+            self.nulls = bytearray()
+
+    def extend(self, values: Sequence[Any]) -> None:
+        if self.nulls is None:
+            self.values.extend(values)
+            return
+        to_number = date.toordinal if self.type_name in DATE_TYPES else None
+        for value in values:
+            if value is None:
+                self.nulls.append(1)
+                self.values.append(0)
+            else:
+                self.nulls.append(0)
+                self.values.append(to_number(value) if to_number else value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.nulls is None:
+            return iter(self.values)
+        from_number = date.fromordinal if self.type_name in DATE_TYPES else None
+        return (
+            None if null else (from_number(value) if from_number else value)
+            for value, null in zip(self.values, self.nulls)
+        )
+
+    @property
+    def agate_type(self) -> Optional[agate.data_types.DataType]:
+        """The column's agate type, or None when it has to be tested."""
+        if self.type_name in INTEGER_TYPES:
+            return Integer(null_values=("null", ""))
+        if self.type_name in FLOAT_TYPES or self.type_name in DECIMAL_TYPES:
+            return Number(null_values=("null", ""))
+        if self.type_name in DATE_TYPES:
+            return agate.data_types.Date(null_values=("null", ""))
+        if self.type_name in TIMESTAMP_TYPES:
+            return agate.data_types.DateTime(null_values=("null", ""))
+        if self.type_name == "BOOLEAN":
+            return agate.data_types.Boolean(null_values=("null", ""))
+        if self.type_name in TEXT_TYPES:
+            # string values keep '' and 'null' as they are
+            return agate.data_types.Text(null_values=())
+        return None
+
+
+class ColumnarResult:
+    """
+    A query result held column by column. It is filled one chunk of rows at
+    a time and only turned into an agate table by :meth:`to_agate`.
+    """
+
+    def __init__(self, column_names: Sequence[str], type_names: Sequence[Optional[str]]):
+        self.column_names = _deduplicate(column_names)
+        self.columns = [
+            ResultColumn(name, type_name)
+            for name, type_name in zip(self.column_names, type_names)
+        ]
+
+    def extend(self, rows: Sequence[Sequence[Any]]) -> None:
+        if not rows:
+            return
+        for column, values in zip(self.columns, zip(*rows)):
+            column.extend(values)
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def column(self, name: str) -> List[Any]:
+        return list(self.columns[self.column_names.index(name)])
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        return zip(*self.columns)
+
+    def to_agate(self) -> agate.Table:
+        column_types = [column.agate_type for column in self.columns]
+        if all(column_type is not None for column_type in column_types):
+            return agate.Table(list(self.rows()), self.column_names, column_types)
+        forced = {
+            name: column_type
+            for name, column_type in zip(self.column_names, column_types)
+            if column_type is not None
+        }
+        tester = agate.TypeTester(force=forced, types=_fallback_types())
+        return agate.Table(list(self.rows()), self.column_names, tester)
+
+
+def _deduplicate(column_names: Sequence[str]) -> List[str]:
+    # Same renaming of repeated column names as SQLConnectionManager.process_results
+    seen: Dict[str, int] = {}
+    names = []
+    for name in column_names:
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}_{seen[name]}"
+        else:
+            seen[name] = 1
+        names.append(name)
+    return names
+
+
+def iter_chunks(cursor, chunk_size: int, limit: Optional[int] = None) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    Yields the cursor's rows in chunks of up to ``chunk_size`` rows, stopping
+    after ``limit`` rows when given.
+    """
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        rows = cursor.fetchmany(size)
+        if not rows:
+            break
+        if remaining is not None:
+            remaining -= len(rows)
+        yield rows
+
+
+def chunk_size_of(cursor) -> int:
+    # DB-API cursors default to an arraysize of 1, far too small to fetch
+    # with, so that is read as not configured
+    return cursor.arraysize if cursor.arraysize > 1 else DEFAULT_CHUNK_SIZE
+
+
+def iter_columnar(
+    cursor, type_names: Sequence[Optional[str]], chunk_size: int, limit: Optional[int] = None
+) -> Iterator[ColumnarResult]:
+    """Yields the cursor's rows as one :class:`ColumnarResult` per chunk."""
+    column_names = [column[0] for column in cursor.description]
+    for rows in iter_chunks(cursor, chunk_size, limit):
+        result = ColumnarResult(column_names, type_names)
+        result.extend(rows)
+        yield result
+
+
+def fetch_columnar(
+    cursor, type_names: Sequence[Optional[str]], chunk_size: int, limit: Optional[int] = None
+) -> ColumnarResult:
+    """Reads the cursor's rows chunk by chunk into a single :class:`ColumnarResult`."""
+    column_names = [column[0] for column in cursor.description]
+    result = ColumnarResult(column_names, type_names)
+    for rows in iter_chunks(cursor, chunk_size, limit):
+        result.extend(rows)
+    return result
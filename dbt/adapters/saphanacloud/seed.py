@@ -0,0 +1,350 @@
+import csv
+import hashlib
+import json
+import math
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, cast
+
+import agate
+from dbt_common.clients.agate_helper import BOM, ISODateTime, Number
+
+# Values which are read as NULL, matching dbt's own seed type tester
+NULL_VALUES = ("null", "")
+
+# Number of leading rows which are kept to build the seed's result table
+SAMPLE_SIZE = 10
+
+# Integer types by their value range, smallest first
+INTEGER_TYPES = (
+    ("SMALLINT", -2 ** 15, 2 ** 15 - 1),
+    ("INTEGER", -2 ** 31, 2 ** 31 - 1),
+    ("BIGINT", -2 ** 63, 2 ** 63 - 1),
+)
+
+# HANA's maximum DECIMAL precision and (N)VARCHAR length
+MAX_DECIMAL_PRECISION = 38
+MAX_STRING_LENGTH = 5000
+
+# Observed string lengths are scaled by this factor and rounded up to the
+# next bucket, so later edits of the seed rarely need a wider column
+STRING_HEADROOM = 1.25
+STRING_LENGTH_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, MAX_STRING_LENGTH)
+
+
+def _candidate_types() -> List[agate.data_types.DataType]:
+    # Same types and preference order as dbt_common's build_type_tester. Its
+    # Integer type only accepts python ints, so it never matches a CSV value
+    # and is left out here.
+    return [
+        Number(null_values=NULL_VALUES),
+        agate.data_types.Date(null_values=NULL_VALUES, date_format="%Y-%m-%d"),
+        agate.data_types.DateTime(null_values=NULL_VALUES, datetime_format="%Y-%m-%d %H:%M:%S"),
+        ISODateTime(null_values=NULL_VALUES),
+        agate.data_types.Boolean(
+            true_values=("true",), false_values=("false",), null_values=NULL_VALUES
+        ),
+        agate.data_types.Text(null_values=NULL_VALUES),
+    ]
+
+
+class SeedColumnProfile:
+    """
+    Type inference state of a single seed column, updated one chunk at a time.
+    Besides the remaining candidate types, the raw values which decide the
+    column's DDL are kept so the type hooks can run on a few rows only.
+    """
+
+    def __init__(self, name: str, force_text: bool = False):
+        self.name = name
+        if force_text:
+            self.candidates = [agate.data_types.Text(null_values=NULL_VALUES)]
+        else:
+            self.candidates = _candidate_types()
+        self.max_precision = 0
+        self.max_precision_value: Optional[str] = None
+        self.min_value: Optional[Tuple[Decimal, Optional[str]]] = None
+        self.max_value: Optional[Tuple[Decimal, Optional[str]]] = None
+        self.longest_value: Optional[str] = None
+        self.unicode_value: Optional[str] = None
+
+    @property
+    def data_type(self) -> agate.data_types.DataType:
+        return self.candidates[0]
+
+    def update(self, values: List[Optional[str]]) -> None:
+        if len(self.candidates) > 1:
+            for candidate in tuple(self.candidates):
+                if not all(candidate.test(value) for value in values):
+                    self.candidates.remove(candidate)
+
+        if isinstance(self.data_type, Number):
+            self._update_number(values)
+        # Text stats are collected from the start, a column can turn out to be
+        # text in any later chunk
+        self._update_text(values)
+
+    def _update_number(self, values: List[Optional[str]]) -> None:
+        to_number = self.data_type.cast
+        for value in values:
+            number = to_number(value)
+            if number is None:
+                continue
+            if self.min_value is None or number < self.min_value[0]:
+                self.min_value = (number, value)
+            if self.max_value is None or number > self.max_value[0]:
+                self.max_value = (number, value)
+            precision = _scale(number)
+            if precision > self.max_precision:
+                self.max_precision = precision
+                self.max_precision_value = value
+
+    def _update_text(self, values: List[Optional[str]]) -> None:
+        for value in values:
+            if value is None:
+                continue
+            if self.longest_value is None or len(value) > len(self.longest_value):
+                self.longest_value = value
+            if self.unicode_value is None and not value.isascii():
+                self.unicode_value = value
+
+    def extremes(self) -> List[str]:
+        """The raw values the column's type has to be able to hold."""
+        values: List[Optional[str]] = []
+        if isinstance(self.data_type, Number):
+            values = [self.max_precision_value]
+            values += [bound[1] for bound in (self.min_value, self.max_value) if bound]
+        elif isinstance(self.data_type, agate.data_types.Text):
+            values = [self.longest_value, self.unicode_value]
+        return [value for value in values if value is not None]
+
+
+def _scale(number: Decimal) -> int:
+    # Same precision as agate.MaxPrecision
+    exponent = number.normalize().as_tuple().exponent
+    return -exponent if isinstance(exponent, int) and exponent < 0 else 0
+
+
+def infer_number_type(values: Iterable[Optional[Decimal]]) -> str:
+    """
+    Picks the smallest HANA type holding every value in a single pass: an
+    integer type when no value has decimal places, DECIMAL(p,s) otherwise.
+    """
+    low = high = None
+    integer_digits = 0
+    scale = 0
+    for value in values:
+        if value is None:
+            continue
+        if not value.is_finite():
+            return "DOUBLE"
+        if low is None or value < low:
+            low = value
+        if high is None or value > high:
+            high = value
+        _, digits, special = value.normalize().as_tuple()
+        # Only NaN and infinity have a non-integer exponent
+        exponent = cast(int, special)
+        integer_digits = max(integer_digits, len(digits) + exponent)
+        scale = max(scale, -exponent)
+
+    if low is None:
+        return "INTEGER"
+
+    assert high is not None
+    if scale == 0:
+        for type_name, min_value, max_value in INTEGER_TYPES:
+            if low >= min_value and high <= max_value:
+                return type_name
+        if integer_digits <= MAX_DECIMAL_PRECISION:
+            return f"DECIMAL({integer_digits},0)"
+        return "DOUBLE"
+
+    precision = max(integer_digits, 0) + scale
+    if precision > MAX_DECIMAL_PRECISION:
+        return "DOUBLE"
+    return f"DECIMAL({precision},{scale})"
+
+
+def infer_text_type(values: Iterable[Optional[str]]) -> str:
+    """
+    Picks VARCHAR, or NVARCHAR when any value is not plain ASCII, sized to the
+    longest value plus headroom. Longer values need a CLOB/NCLOB.
+    """
+    max_length = 0
+    unicode = False
+    for value in values:
+        if value is None:
+            continue
+        max_length = max(max_length, len(value))
+        unicode = unicode or not value.isascii()
+
+    if max_length > MAX_STRING_LENGTH:
+        return "NCLOB" if unicode else "CLOB"
+
+    wanted = math.ceil(max_length * STRING_HEADROOM)
+    length = next(size for size in STRING_LENGTH_BUCKETS if size >= min(wanted, MAX_STRING_LENGTH))
+    return f"NVARCHAR({length})" if unicode else f"VARCHAR({length})"
+
+
+# Digits before the decimal point each integer type can hold, smallest first
+INTEGER_DIGITS = (("TINYINT", 3), ("SMALLINT", 5), ("INTEGER", 10), ("BIGINT", 19))
+STRING_TYPES = ("VARCHAR", "NVARCHAR")
+
+# A column type as (type name, length or precision, scale)
+TypeSpec = Tuple[str, Optional[int], Optional[int]]
+
+
+def _format_type(spec: TypeSpec) -> str:
+    name, length, scale = spec
+    if name == "DECIMAL" and length is not None:
+        return f"DECIMAL({length},{scale or 0})"
+    if name in STRING_TYPES and length is not None:
+        return f"{name}({length})"
+    return name
+
+
+def widen_type(current: TypeSpec, wanted: TypeSpec) -> Optional[str]:
+    """
+    The type a ``current`` column has to be altered to so it also holds the
+    values of the ``wanted`` type, ``current`` itself when it already does.
+    None when no column type holds both, e.g. for a DATE and a VARCHAR.
+    """
+    integers = dict(INTEGER_DIGITS)
+    current_name, current_length, current_scale = current
+    wanted_name, wanted_length, wanted_scale = wanted
+
+    if current_name in STRING_TYPES and wanted_name in STRING_TYPES:
+        name = "NVARCHAR" if "NVARCHAR" in (current_name, wanted_name) else current_name
+        return _format_type((name, max(current_length or 0, wanted_length or 0), None))
+
+    if current_name == "DOUBLE" and (wanted_name in integers or wanted_name == "DECIMAL"):
+        return "DOUBLE"
+
+    numeric = [spec for spec in (current, wanted) if spec[0] in integers or spec[0] == "DECIMAL"]
+    if len(numeric) == 2:
+        if current_name in integers and wanted_name in integers:
+            names = [name for name, _ in INTEGER_DIGITS]
+            return max(current_name, wanted_name, key=names.index)
+        digits = max(
+            integers[name] if name in integers else (length or 0) - (scale or 0)
+            for name, length, scale in numeric
+        )
+        scale = max(scale or 0 for _, _, scale in numeric)
+        if digits + scale > MAX_DECIMAL_PRECISION:
+            return None
+        return _format_type(("DECIMAL", digits + scale, scale))
+
+    if current_name == wanted_name:
+        return _format_type(current)
+    return None
+
+
+class SeedFile:
+    """
+    A seed CSV file which is read in chunks of ``chunk_size`` rows instead of
+    being loaded into a single agate table.
+
+    :meth:`profile` makes a first pass over the file to infer the column types,
+    :meth:`iter_batches` makes a second one and yields the converted rows.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        text_columns: Iterable[str] = (),
+        delimiter: str = ",",
+        chunk_size: int = 10000,
+    ):
+        self.path = path
+        self.delimiter = delimiter
+        self.chunk_size = chunk_size
+        self.row_count = 0
+
+        with self._open() as fp:
+            header = next(csv.reader(fp, delimiter=self.delimiter), [])
+        self.column_names: Tuple[str, ...] = tuple(header)
+
+        text_columns = set(text_columns)
+        self.columns = [
+            SeedColumnProfile(name, force_text=name in text_columns)
+            for name in self.column_names
+        ]
+        self._sample: List[List[Optional[str]]] = []
+
+    def _open(self):
+        fp = open(self.path, encoding="utf-8", newline="")
+        if fp.read(1) != BOM:
+            fp.seek(0)
+        return fp
+
+    def _pad(self, row: List[str]) -> List[Optional[str]]:
+        missing = len(self.column_names) - len(row)
+        if missing < 0:
+            raise ValueError(
+                f"Row has {len(row)} values, but {self.path} only has "
+                f"{len(self.column_names)} columns."
+            )
+        return row + [None] * missing
+
+    def iter_chunks(self) -> Iterator[List[List[Optional[str]]]]:
+        with self._open() as fp:
+            reader = csv.reader(fp, delimiter=self.delimiter)
+            next(reader, None)
+            chunk = []
+            for row in reader:
+                chunk.append(self._pad(row))
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+    def profile(self) -> "SeedFile":
+        self.row_count = 0
+        self._sample = []
+        for chunk in self.iter_chunks():
+            if len(self._sample) < SAMPLE_SIZE:
+                self._sample.extend(chunk[:SAMPLE_SIZE - len(self._sample)])
+            self.row_count += len(chunk)
+            for idx, column in enumerate(self.columns):
+                column.update([row[idx] for row in chunk])
+        return self
+
+    @property
+    def column_types(self) -> List[agate.data_types.DataType]:
+        return [column.data_type for column in self.columns]
+
+    def to_agate_table(self) -> agate.Table:
+        """
+        A small table with the inferred column types, holding the first rows
+        of the file followed by every column's extreme values. Running the
+        adapter's type conversion on it gives the same DDL as on the full file.
+        """
+        extremes = [column.extremes() for column in self.columns]
+        rows = [list(row) for row in self._sample]
+        for idx in range(max((len(values) for values in extremes), default=0)):
+            rows.append([
+                values[idx] if idx < len(values) else None for values in extremes
+            ])
+        return agate.Table(rows, self.column_names, self.column_types)
+
+    def iter_batches(self) -> Iterator[List[Tuple[Any, ...]]]:
+        casts = [column_type.cast for column_type in self.column_types]
+        for chunk in self.iter_chunks():
+            yield [
+                tuple(cast(value) for cast, value in zip(casts, row))
+                for row in chunk
+            ]
+
+
+def seed_file_hash(path: str, config: Dict[str, Any]) -> str:
+    """
+    sha256 of the seed file's content and the parts of its config which
+    change how the file is loaded.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for block in iter(lambda: fp.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
@@ -407,6 +407,7 @@ Example 3 of 3 of required macros that does not have a default implementation.
             {% endset %}
             {% do run_query(alter_sql) %}
         {% endfor %}
+        {% do adapter.invalidate_columns(target_relation) %}
     {% else %}
     {% endif %}
     
@@ -39,6 +39,8 @@
     {% endfor %}
   {% endif %}
 
+  {% do adapter.invalidate_columns(relation) %}
+
 {% endmacro %}
 
 
@@ -0,0 +1,40 @@
+{#-- Memory of a column table in bytes, summed over its partitions --#}
+{% macro saphanacloud__get_table_memory_size(relation) %}
+  {% set sql %}
+    select coalesce(sum(memory_size_in_total), 0)
+    from m_cs_tables
+    where schema_name = '{{ relation.schema }}' and table_name = '{{ relation.identifier }}'
+  {% endset %}
+  {{ return(run_query(sql).rows[0][0]) }}
+{% endmacro %}
+
+
+{#-- The `optimize_compression` config: re-optimizes the compression of a freshly loaded column table --#}
+{% macro saphanacloud__optimize_compression(relation, full_refresh, rows_affected=none) %}
+  {%- set optimize = config.get('optimize_compression', false) -%}
+  {%- if optimize is not boolean -%}
+    {% do exceptions.raise_compiler_error("`optimize_compression` must be a boolean, got: " ~ optimize) %}
+  {%- endif -%}
+  {%- if not optimize or config.get('table_type') == 'row' -%}
+    {{ return(none) }}
+  {%- endif -%}
+
+  {#- Incremental loads only change the compression notably when they are large -#}
+  {%- set threshold = config.get('optimize_compression_threshold', 100000) -%}
+  {%- if threshold is not number or threshold < 0 -%}
+    {% do exceptions.raise_compiler_error("`optimize_compression_threshold` must be a non-negative integer, got: " ~ threshold) %}
+  {%- endif -%}
+  {%- if not full_refresh and rows_affected is number and 0 <= rows_affected < threshold -%}
+    {{ log("Skipping compression optimization of " ~ relation ~ ", " ~ rows_affected ~ " rows are below the threshold of " ~ threshold) }}
+    {{ return(none) }}
+  {%- endif -%}
+
+  {%- set size_before = saphanacloud__get_table_memory_size(relation) -%}
+  {% call statement('optimize_compression') -%}
+    update {{ relation }} with parameters ('OPTIMIZE_COMPRESSION' = 'FORCE')
+  {%- endcall %}
+  {%- set size_after = saphanacloud__get_table_memory_size(relation) -%}
+
+  {{ log("Optimized compression of " ~ relation ~ ": MEMORY_SIZE_IN_TOTAL "
+         ~ size_before ~ " -> " ~ size_after ~ " bytes", info=true) }}
+{% endmacro %}
@@ -0,0 +1,35 @@
+{#-- The `delta_merge` config: when to merge the delta storage of a column table after a load --#}
+{% macro saphanacloud__get_delta_merge_mode() %}
+  {%- set mode = config.get('delta_merge', 'never') -%}
+  {%- if mode not in ['never', 'auto', 'always', 'smart'] -%}
+    {% do exceptions.raise_compiler_error("`delta_merge` must be one of 'never', 'auto', 'always' or 'smart', got: " ~ mode) %}
+  {%- endif -%}
+  {%- if config.get('table_type') == 'row' -%}
+    {#- row tables have no delta storage -#}
+    {{ return('never') }}
+  {%- endif -%}
+  {{ return(mode) }}
+{% endmacro %}
+
+
+{#-- Merges the delta of `relation` after a load of `rows_affected` rows (none when unknown) --#}
+{% macro saphanacloud__delta_merge(relation, rows_affected=none) %}
+  {%- set mode = saphanacloud__get_delta_merge_mode() -%}
+  {%- if mode == 'never' -%}
+    {{ return(none) }}
+  {%- endif -%}
+
+  {%- set threshold = config.get('delta_merge_threshold', 100000) -%}
+  {%- if threshold is not number or threshold < 0 -%}
+    {% do exceptions.raise_compiler_error("`delta_merge_threshold` must be a non-negative integer, got: " ~ threshold) %}
+  {%- endif -%}
+  {%- if mode == 'auto' and rows_affected is number and 0 <= rows_affected < threshold -%}
+    {{ log("Skipping delta merge of " ~ relation ~ ", " ~ rows_affected ~ " rows are below the threshold of " ~ threshold) }}
+    {{ return(none) }}
+  {%- endif -%}
+
+  {% call statement('delta_merge') -%}
+    merge delta of {{ relation }}
+    {%- if mode == 'smart' %} with parameters ('SMART_MERGE' = 'ON'){% endif %}
+  {%- endcall %}
+{% endmacro %}
@@ -0,0 +1,44 @@
+{#-- The `WITH HINT(...)` clause for the `hints` config, e.g. ['USE_OLAP_PLAN', 'MAX_CONCURRENCY(4)'] --#}
+{% macro saphanacloud__hint_clause() %}
+  {%- set hints = config.get('hints') -%}
+  {%- if not hints -%}
+    {{ return('') }}
+  {%- endif -%}
+  {%- if hints is string -%}
+    {%- set hints = [hints] -%}
+  {%- endif -%}
+  {%- if hints is not iterable or hints is mapping -%}
+    {% do exceptions.raise_compiler_error("`hints` must be a hint name or a list of hints, got: " ~ hints) %}
+  {%- endif -%}
+  {%- for hint in hints -%}
+    {%- if not saphanacloud__is_valid_hint(hint) -%}
+      {% do exceptions.raise_compiler_error("Invalid hint in `hints`: " ~ hint) %}
+    {%- endif -%}
+  {%- endfor -%}
+  {{ return('WITH HINT(' ~ hints | join(', ') ~ ')') }}
+{% endmacro %}
+
+
+{#-- A hint name with an optional argument list, which must be a single balanced pair of parentheses --#}
+{% macro saphanacloud__is_valid_hint(hint) %}
+  {%- if hint is not string or not modules.re.match('^[A-Z_][A-Z0-9_]*(\(.*\))?$', hint) -%}
+    {{ return(false) }}
+  {%- endif -%}
+  {%- if ';' in hint or '--' in hint or '/*' in hint -%}
+    {{ return(false) }}
+  {%- endif -%}
+  {%- set state = namespace(depth=0, valid=true) -%}
+  {%- for char in hint -%}
+    {%- if char == '(' -%}
+      {%- set state.depth = state.depth + 1 -%}
+    {%- elif char == ')' -%}
+      {%- set state.depth = state.depth - 1 -%}
+      {#-- the parenthesis opened after the name may only be closed at the end --#}
+      {%- if state.depth < 0 or (state.depth == 0 and not loop.last) -%}
+        {%- set state.valid = false -%}
+      {%- endif -%}
+    {%- endif -%}
+  {%- endfor -%}
+  {{ return(state.valid and state.depth == 0) }}
+{% endmacro %}
+
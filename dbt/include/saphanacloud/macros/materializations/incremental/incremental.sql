@@ -123,6 +123,8 @@
   {{ run_hooks(pre_hooks, inside_transaction=True) }}
 
   {% set to_drop = [] %}
+
+  {% set load_existing = existing_relation is not none and not full_refresh_mode %}
   
 
   -- Case 1 - no partitioning (default dbt)
@@ -136,6 +138,8 @@
           {% set need_swap = true %}
       {% else %}
         {% do run_query(get_create_table_as_sql(True, temp_relation, sql)) %}
+        {#-- a temp relation of an earlier batch may have had other columns --#}
+        {% do adapter.invalidate_columns(temp_relation) %}
         {% do adapter.expand_target_column_types(
                 from_relation=temp_relation,
                 to_relation=target_relation) %}
@@ -157,6 +161,8 @@
       {% call statement("main") %}
           {{ build_sql }}
       {% endcall %}
+      {% do adapter.invalidate_columns(target_relation) %}
+      {% do adapter.invalidate_columns(intermediate_relation) %}
 
       {% do to_drop.append(temp_relation) %}
 
@@ -256,6 +262,9 @@
   -- `COMMIT` happens here
   {% do adapter.commit() %}
 
+  {% do saphanacloud__delta_merge(target_relation, load_result('main')['response'].rows_affected) %}
+  {% do saphanacloud__optimize_compression(target_relation, not load_existing, load_result('main')['response'].rows_affected) %}
+
   {% for rel in to_drop %}
       {% do adapter.drop_relation(rel) %}
   {% endfor %}
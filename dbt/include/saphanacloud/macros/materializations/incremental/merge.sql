@@ -46,7 +46,8 @@
         ({% for column_name in dest_cols_list -%}
             DBT_INTERNAL_SOURCE.{{ column_name }}
             {%- if not loop.last %}, {%- endif %}
-        {%- endfor %});
+        {%- endfor %})
+    {{ saphanacloud__hint_clause() }};
 
 {% endmacro %}
 
@@ -68,7 +69,8 @@
                         and {{ predicate }}
                     {% endfor %}
                 {% endif %}
-            );
+            )
+            {{ saphanacloud__hint_clause() }};
         {% else %}
             delete from {{ target }}
             where (
@@ -80,7 +82,8 @@
                 {% for predicate in incremental_predicates %}
                     and {{ predicate }}
                 {% endfor %}
-            {%- endif -%};
+            {%- endif %}
+            {{ saphanacloud__hint_clause() }};
 
         {% endif %}
     {% endif %}
@@ -89,6 +92,7 @@
     (
         select {{ dest_cols_csv }}
         from {{ source }}
-    );
+    )
+    {{ saphanacloud__hint_clause() }};
 
 {%- endmacro %}
\ No newline at end of file
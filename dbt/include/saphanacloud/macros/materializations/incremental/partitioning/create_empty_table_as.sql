@@ -23,8 +23,15 @@
 
     {% set tmp_create__empty_table_sql = get_partitioned_sql(sql, empty_filter) %}
 
-    {% set create__empty_table_sql = get_create_table_as_sql(temporary, relation, tmp_create__empty_table_sql) | replace(';', ' WITH NO DATA WITHOUT CONSTRAINT;')  %}
+    {#-- the empty table is created without the hint clause, the partition inserts are hinted --#}
+    {% set create__empty_table_sql = get_create_table_as_sql(temporary, relation, tmp_create__empty_table_sql) %}
+    {% set hint_clause = saphanacloud__hint_clause() %}
+    {% if hint_clause %}
+        {% set create__empty_table_sql = create__empty_table_sql | replace(hint_clause, '') %}
+    {% endif %}
+    {% set create__empty_table_sql = create__empty_table_sql | replace(';', ' WITH NO DATA WITHOUT CONSTRAINT;')  %}
 
     {% do run_query(create__empty_table_sql) %}
+    {% do adapter.invalidate_columns(relation) %}
 
 {%- endmacro %}
\ No newline at end of file
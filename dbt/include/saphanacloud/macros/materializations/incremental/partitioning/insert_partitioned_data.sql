@@ -34,6 +34,7 @@
             (
                 {{ sql_for_partition }}
             )
+            {{ saphanacloud__hint_clause() }}
 
         {%- endcall %}
 
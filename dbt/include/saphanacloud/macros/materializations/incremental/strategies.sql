@@ -17,6 +17,7 @@
     (
         select {{ dest_cols_csv }}
         from {{ temp_relation }}
-    );
+    )
+    {{ saphanacloud__hint_clause() }};
     {% endif %}
 {% endmacro %}
\ No newline at end of file
@@ -0,0 +1,90 @@
+{% macro saphanacloud__merge_csv_rows(model, agate_table, seed_file=none) %}
+    {%- set unique_key = config.get('unique_key') -%}
+    {%- if not unique_key -%}
+        {% do exceptions.raise_compiler_error("`load_strategy: merge` requires a `unique_key` for seed " ~ this.render()) %}
+    {%- endif -%}
+    {%- set unique_key = [unique_key] if unique_key is string else unique_key -%}
+    {#- The key columns are quoted like the columns of the seed table -#}
+    {%- set quote_seed_column = model['config'].get('quote_columns', None) -%}
+    {%- set quoted_keys = [] -%}
+    {%- for key in unique_key -%}
+        {%- do quoted_keys.append(adapter.quote_seed_column(key, quote_seed_column)) -%}
+    {%- endfor -%}
+
+    {%- set staging_relation = this.incorporate(path={"identifier": this.identifier ~ '__dbt_seed_stage'}, type='table') -%}
+    {% do adapter.drop_relation(staging_relation) %}
+
+    {# Stage the whole file, the same way a full reload would load it #}
+    {% set create_sql = saphanacloud__create_seed_table(model, agate_table, staging_relation) %}
+    {% if seed_file is not none %}
+        {% set load_sql = saphanacloud__stream_load_csv_rows(model, seed_file, staging_relation)['sql'] %}
+    {% else %}
+        {% set load_sql = saphanacloud__basic_load_csv_rows(model, agate_table, staging_relation)['sql'] %}
+    {% endif %}
+
+    {# Only merge into a table with the same columns, otherwise the caller recreates it.
+       Types inferred wider from the new rows widen the existing columns. #}
+    {%- set dest_columns = adapter.get_columns_in_relation(this) -%}
+    {%- set staging_columns = adapter.get_columns_in_relation(staging_relation) -%}
+    {%- set column_changes = adapter.get_seed_column_changes(dest_columns, staging_columns) -%}
+
+    {% if column_changes is none %}
+        {{ log("Columns of " ~ this.render() ~ " changed, recreating it instead of merging", info=True) }}
+        {% do adapter.drop_relation(staging_relation) %}
+        {{ return({'merged': false}) }}
+    {% endif %}
+
+    {% set alter_sql = [] %}
+    {% for change in column_changes %}
+        {% set sql -%}
+            alter table {{ this.render() }} alter ("{{ change['name'] }}" {{ change['data_type'] }})
+        {%- endset %}
+        {% call statement('seed_widen_column') %}
+            {{ sql }}
+        {% endcall %}
+        {% do alter_sql.append(sql ~ ';') %}
+    {% endfor %}
+    {% if column_changes %}
+        {% do adapter.invalidate_columns(this) %}
+    {% endif %}
+
+    {%- set dest_cols_csv = get_quoted_csv(dest_columns | map(attribute="name")) -%}
+
+    {# Rows whose key is no longer in the file #}
+    {% set delete_sql %}
+        delete from {{ this.render() }} as DBT_INTERNAL_DEST
+        where not exists (
+            select 1 from {{ staging_relation.render() }} as DBT_INTERNAL_SOURCE
+            where {% for key in quoted_keys -%}
+                DBT_INTERNAL_SOURCE.{{ key }} = DBT_INTERNAL_DEST.{{ key }}
+                {%- if not loop.last %} and {% endif %}
+            {%- endfor %}
+        )
+    {% endset %}
+    {% call statement('seed_delete') %}
+        {{ delete_sql }}
+    {% endcall %}
+    {% set rows_deleted = load_result('seed_delete')['response'].rows_affected %}
+
+    {# New and changed rows only, unchanged rows are never rewritten #}
+    {% set source_sql %}
+        (
+            select {{ dest_cols_csv }} from {{ staging_relation.render() }}
+            except
+            select {{ dest_cols_csv }} from {{ this.render() }}
+        )
+    {% endset %}
+    {% set merge_sql = saphanacloud__get_merge_sql(this.render(), source_sql, quoted_keys, dest_columns) %}
+    {% call statement('seed_merge') %}
+        {{ merge_sql }}
+    {% endcall %}
+    {% set rows_merged = load_result('seed_merge')['response'].rows_affected %}
+
+    {% do adapter.drop_relation(staging_relation) %}
+
+    {{ return({
+        'merged': true,
+        'rows_affected': rows_deleted + rows_merged,
+        'sql': ([create_sql, load_sql] + alter_sql + [delete_sql ~ ';', merge_sql | trim | trim(';')]) | join('\n')
+    }) }}
+{% endmacro %}
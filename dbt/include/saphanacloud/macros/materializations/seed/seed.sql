@@ -1,25 +1,157 @@
+{% materialization seed, adapter='saphanacloud' %}
+
+  {%- set identifier = model['alias'] -%}
+  {%- set full_refresh_mode = (should_full_refresh()) -%}
+
+  {%- set old_relation = adapter.get_relation(database=database, schema=schema, identifier=identifier) -%}
+
+  {%- set exists_as_table = (old_relation is not none and old_relation.is_table) -%}
+  {%- set exists_as_view = (old_relation is not none and old_relation.is_view) -%}
+
+  {%- set grant_config = config.get('grants') -%}
+
+  {#- With `skip_unchanged` the table is left as it is when the hash of the
+      seed file and its config matches the one recorded at the last load -#}
+  {%- set recreate = full_refresh_mode -%}
+  {%- set seed_hash = none -%}
+  {%- set unchanged = false -%}
+  {%- if config.get('skip_unchanged', false) -%}
+    {%- set seed_hash = adapter.get_seed_hash(model) -%}
+    {%- if exists_as_table and not full_refresh_mode -%}
+      {%- set unchanged = (saphanacloud__get_seed_hash(this) == seed_hash) -%}
+    {%- endif -%}
+  {%- endif -%}
+
+  {#- An unchanged seed neither reads the table nor rewrites its comment,
+      only its grants and hooks are applied -#}
+  {%- if unchanged -%}
+    {%- do store_result('agate_table', response='OK', agate_table=none) -%}
+    {{ run_hooks(pre_hooks, inside_transaction=False) }}
+    {{ run_hooks(pre_hooks, inside_transaction=True) }}
+    {% call noop_statement('main', 'UNCHANGED 0', 'UNCHANGED', 0) %}
+      -- {{ model['original_file_path'] }} is unchanged since the last load (hash {{ seed_hash }}), load skipped
+    {% endcall %}
+    {% do apply_grants(this.incorporate(type='table'), grant_config, should_revoke=should_revoke(old_relation, false)) %}
+    {{ run_hooks(post_hooks, inside_transaction=True) }}
+    {{ adapter.commit() }}
+    {{ run_hooks(post_hooks, inside_transaction=False) }}
+    {{ return({'relations': [this.incorporate(type='table')]}) }}
+  {%- endif -%}
+
+  {#- With `streaming` the CSV is read in chunks of `batch_size` rows, the
+      agate table only holds a sample which is enough to infer the DDL -#}
+  {%- set streaming = config.get('streaming', false) -%}
+  {%- if streaming -%}
+    {%- set seed_file = adapter.get_seed_file(model, get_batch_size()) -%}
+    {%- set agate_table = seed_file.to_agate_table() -%}
+    {%- set rows_affected = seed_file.row_count -%}
+  {%- else -%}
+    {%- set agate_table = load_agate_table() -%}
+    {%- set rows_affected = (agate_table.rows | length) -%}
+  {%- endif -%}
+
+  {%- do store_result('agate_table', response='OK', agate_table=agate_table) -%}
+
+  {{ run_hooks(pre_hooks, inside_transaction=False) }}
+
+  -- `BEGIN` happens here:
+  {{ run_hooks(pre_hooks, inside_transaction=True) }}
+
+  -- build model
+  {#- With `load_strategy: merge` an existing table only receives the rows
+      which changed, a staging table is loaded and merged by `unique_key` -#}
+  {%- set load_strategy = config.get('load_strategy', 'reload') -%}
+  {%- if load_strategy not in ['reload', 'merge'] -%}
+    {% do exceptions.raise_compiler_error("`load_strategy` must be 'reload' or 'merge', got: " ~ load_strategy) %}
+  {%- endif -%}
+
+  {% set merged = none %}
+  {% if exists_as_table and load_strategy == 'merge' and not full_refresh_mode %}
+    {% set merged = saphanacloud__merge_csv_rows(model, agate_table, seed_file if streaming else none) %}
+  {% endif %}
+
+  {% if merged is not none and merged['merged'] %}
+    {% set code = 'MERGE' %}
+    {% set rows_affected = merged['rows_affected'] %}
+    {% set create_table_sql = merged['sql'] %}
+    {% set sql = "" %}
+  {% else %}
+    {#- A merge falls back to recreating the table when the columns changed -#}
+    {% if merged is not none %}
+      {% set recreate = true %}
+    {% endif %}
+    {% set create_table_sql = "" %}
+    {% if exists_as_view %}
+      {{ exceptions.raise_compiler_error("Cannot seed to '{}', it is a view".format(old_relation.render())) }}
+    {% elif exists_as_table %}
+      {% set create_table_sql = reset_csv_table(model, recreate, old_relation, agate_table) %}
+    {% else %}
+      {% set create_table_sql = create_csv_table(model, agate_table) %}
+    {% endif %}
+
+    {% set code = 'CREATE' if recreate else 'INSERT' %}
+    {% set sql = "" %}
+    {% if rows_affected > 0 %}
+      {% if streaming %}
+        {% set loaded = saphanacloud__stream_load_csv_rows(model, seed_file) %}
+      {% else %}
+        {% set loaded = saphanacloud__basic_load_csv_rows(model, agate_table) %}
+      {% endif %}
+      {#- The rows HANA inserted, not the rows read from the file -#}
+      {% set sql = loaded['sql'] %}
+      {% set rows_affected = loaded['rows_affected'] %}
+    {% endif %}
+  {% endif %}
+
+  {% call noop_statement('main', code ~ ' ' ~ rows_affected, code, rows_affected) %}
+    {{ get_csv_sql(create_table_sql, sql) }};
+  {% endcall %}
+
+  {% set target_relation = this.incorporate(type='table') %}
+
+  {% set should_revoke = should_revoke(old_relation, recreate) %}
+  {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
+
+  {% do persist_docs(target_relation, model) %}
+
+  {#- Recorded after persist_docs, which may have replaced the table comment -#}
+  {% if seed_hash is not none %}
+    {% do saphanacloud__set_seed_hash(target_relation, seed_hash) %}
+  {% endif %}
+
+  {% if recreate or not exists_as_table %}
+    {% do create_indexes(target_relation) %}
+  {% endif %}
+
+  {{ run_hooks(post_hooks, inside_transaction=True) }}
+
+  -- `COMMIT` happens here
+  {{ adapter.commit() }}
+
+  {% do saphanacloud__delta_merge(target_relation, rows_affected) %}
+
+  {{ run_hooks(post_hooks, inside_transaction=False) }}
+
+  {{ return({'relations': [target_relation]}) }}
+
+{% endmaterialization %}
+
+
 {% macro saphanacloud__create_csv_table(model, agate_table) %}
+  {{ return(saphanacloud__create_seed_table(model, agate_table, this)) }}
+{% endmacro %}
+
+
+{% macro saphanacloud__create_seed_table(model, agate_table, relation) %}
   {%- set column_override = model['config'].get('column_types', {}) -%}
   {%- set quote_seed_column = model['config'].get('quote_columns', None) -%}
 
-  {%- set default_string_type = 'VARCHAR(5000)' -%} 
-
   {% set sql %}
-    create table {{ this.render() }} (
+    create table {{ relation.render() }} (
         {%- for col_name in agate_table.column_names -%}
-            {%- set inferred_type = adapter.convert_type(agate_table, loop.index0) | lower -%}
+            {%- set inferred_type = adapter.convert_type(agate_table, loop.index0) -%}
+            {%- set type = column_override.get(col_name, inferred_type) -%}
             {%- set column_name = (col_name | string) -%}
-
-            {%- if col_name in column_override %}
-              {%- set type = column_override.get(col_name) -%}
-            {%- else %}
-              {%- if inferred_type == 'string' or inferred_type == 'varchar' -%}
-                {%- set type = default_string_type -%}
-              {%- else -%}
-                {%- set type = inferred_type -%}
-              {%- endif -%}
-            {%- endif -%}
-
             {{ adapter.quote_seed_column(column_name, quote_seed_column) }} {{ type }} {%- if not loop.last -%}, {%- endif -%}
         {%- endfor -%}
     )
@@ -28,47 +160,113 @@
   {% call statement('_') -%}
     {{ sql }}
   {%- endcall %}
+  {% do adapter.invalidate_columns(relation) %}
 
   {{ return(sql) }}
 {% endmacro %}
 
  
 
-{% macro saphanacloud__basic_load_csv_rows(model, agate_table) %}
-
-    {% set cols_sql = get_seed_column_quoted_csv(model, agate_table.column_names) %}
-    
-    {% set statements = [] %}
-
-    {% for row in agate_table.rows %}
-        {% set sql %}
-            insert into {{ this.render() }} ({{ cols_sql }}) values(
-            {%- for column in agate_table.column_names -%}
-                 {%- if row[column] is boolean -%}
-                  {{ row[column] }} 
-              {%- else -%}
-                  '{{ row[column] }}' 
-              {%- endif -%}
-                {%- if not loop.last %},{%- endif %}
-            {%- endfor %})
-        {% endset %}
-        
-        {# Add the query to execute the insertion #}
-        {% do adapter.add_query(sql, abridge_sql_log=True) %}
-
-        {# Write each insert query to the compiled SQL #}
-        {{ write(sql) }}
-
-        {# Collect all queries for logging #}
-        {% do statements.append(sql) %}
-    {% endfor %}
-
-    {# Return all SQL statements concatenated for the compiled file #}
-    {{ return(statements | join(';\n')) }}
+{% macro saphanacloud__get_table_comment(relation) %}
+  {% set sql %}
+    select COMMENTS from SYS.TABLES
+    where SCHEMA_NAME = '{{ relation.schema }}' and TABLE_NAME = '{{ relation.identifier }}'
+  {% endset %}
+  {% set result = run_query(sql) %}
+  {{ return(result.rows[0][0] if result.rows | length > 0 else none) }}
+{% endmacro %}
+
+
+{% macro saphanacloud__seed_hash_pattern() %}
+  {{ return('\\[dbt seed hash: ([0-9a-f]+)\\]') }}
+{% endmacro %}
+
+
+{% macro saphanacloud__get_seed_hash(relation) %}
+  {#- The hash is kept as a marker within the table comment, next to any description -#}
+  {% set comment = saphanacloud__get_table_comment(relation) %}
+  {% set match = modules.re.search(saphanacloud__seed_hash_pattern(), comment or '') %}
+  {{ return(match.group(1) if match else none) }}
+{% endmacro %}
+
+
+{% macro saphanacloud__set_seed_hash(relation, seed_hash) %}
+  {#- The marker replaces the one of the last load, the rest of the comment is kept -#}
+  {% set comment = modules.re.sub(saphanacloud__seed_hash_pattern(), '', saphanacloud__get_table_comment(relation) or '') | trim %}
+  {% set comment = (comment ~ ' ' if comment else '') ~ '[dbt seed hash: ' ~ seed_hash ~ ']' %}
+  {% call statement('set_seed_hash') -%}
+    comment on table {{ relation.render() }} is '{{ comment | replace("'", "''") }}'
+  {%- endcall %}
+{% endmacro %}
+
+
+{% macro saphanacloud__get_binding_char() %}
+  {{ return('?') }}
+{% endmacro %}
+
+
+{% macro saphanacloud__get_batch_size() %}
+  {%- set batch_size = config.get('batch_size', 10000) -%}
+  {%- if batch_size is not number or batch_size < 1 -%}
+    {% do exceptions.raise_compiler_error("`batch_size` must be a positive integer, got: " ~ batch_size) %}
+  {%- endif -%}
+  {{ return(batch_size) }}
+{% endmacro %}
+
+
+{% macro saphanacloud__get_load_threads() %}
+  {%- set load_threads = config.get('load_threads', 1) -%}
+  {%- if load_threads is not number or load_threads < 1 -%}
+    {% do exceptions.raise_compiler_error("`load_threads` must be a positive integer, got: " ~ load_threads) %}
+  {%- endif -%}
+  {{ return(load_threads) }}
+{% endmacro %}
+
+
+{% macro saphanacloud__get_seed_insert_sql(model, column_names, relation=none) %}
+    {% set relation = relation or this %}
+    {% set cols_sql = get_seed_column_quoted_csv(model, column_names) %}
+
+    {% set sql %}
+        insert into {{ relation.render() }} ({{ cols_sql }}) values (
+            {%- for column in column_names -%}
+                {{ get_binding_char() }}
+                {%- if not loop.last %}, {% endif -%}
+            {%- endfor -%})
+    {% endset %}
+
+    {{ return(sql) }}
+{% endmacro %}
+
+
+{% macro saphanacloud__basic_load_csv_rows(model, agate_table, relation=none) %}
+
+    {% set batch_size = get_batch_size() %}
+    {% set sql = saphanacloud__get_seed_insert_sql(model, agate_table.column_names, relation) %}
+
+    {# Send the rows in batches, every batch is a single executemany round trip #}
+    {% set rows_loaded = adapter.load_seed_batches(sql, agate_table.rows | batch(batch_size), saphanacloud__get_load_threads()) %}
+
+    {# The parameterized statement is rendered into the compiled file #}
+    {{ return({'sql': sql, 'rows_affected': rows_loaded}) }}
+{% endmacro %}
+
+
+{% macro saphanacloud__stream_load_csv_rows(model, seed_file, relation=none) %}
+
+    {% set sql = saphanacloud__get_seed_insert_sql(model, seed_file.column_names, relation) %}
+
+    {# The file is read again chunk by chunk, every chunk is one executemany round trip #}
+    {% set rows_loaded = adapter.load_seed_file(sql, seed_file, saphanacloud__get_load_threads()) %}
+
+    {{ return({
+        'sql': sql ~ " /* streamed from " ~ model['original_file_path'] ~ " */",
+        'rows_affected': rows_loaded
+    }) }}
 {% endmacro %}
 
 {% macro saphanacloud__load_csv_rows(model, agate_table) %}
-  {{ return(saphanacloud__basic_load_csv_rows(model, agate_table)) }}
+  {{ return(saphanacloud__basic_load_csv_rows(model, agate_table)['sql']) }}
 {% endmacro %}
 
 
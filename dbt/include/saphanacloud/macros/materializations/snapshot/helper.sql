@@ -20,6 +20,7 @@
             {{ sql }}
         {% endcall %}
     {% endfor %}
+    {% do adapter.invalidate_columns(relation) %}
 {% endmacro %}
 
 {% macro saphanacloud__post_snapshot(staging_relation) %}
@@ -27,6 +28,9 @@
     
     -- Then, drop the staging table
     {% do adapter.drop_relation(staging_relation) %}
+
+    -- Merge the rows the snapshot changed from the delta
+    {% do saphanacloud__delta_merge(this, load_result('main')['response'].rows_affected) %}
 {% endmacro %}
 
 {% macro saphanacloud__snapshot_staging_table(strategy, source_sql, target_relation) -%}
@@ -23,7 +23,8 @@
     when not matched
     and DBT_INTERNAL_SOURCE.dbt_change_type = 'insert'
     then insert ({{ insert_cols_csv }})
-    values ({{ select_columns | join(', ') }});
+    values ({{ select_columns | join(', ') }})
+    {{ saphanacloud__hint_clause() }};
 
 {% endmacro %}
 
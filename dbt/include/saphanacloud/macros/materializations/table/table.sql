@@ -1,6 +1,4 @@
 {% materialization table, adapter='saphanacloud', supported_languages=['sql', 'python'] -%}
-  {% set relation = adapter.dispatch('list_relations_without_caching')(adapter.Relation.create(schema=this.schema)) %}
-  
 
    {% set grant_config = config.get('grants') %}
    {% set language = model['language'] %}
@@ -65,9 +63,12 @@
     {%- call statement('main', fetch_result=True) -%}
       INSERT INTO {{ intermediate_relation }} (
         {{ model.compiled_sql }}
-      );
+      )
+      {{ saphanacloud__hint_clause() }};
     {%- endcall -%}
   {% endif %}
+  {#-- columns read before the table was (re)built are stale now --#}
+  {% do adapter.invalidate_columns(intermediate_relation) %}
  
     -- cleanup
   {% if existing_relation is not none %}
@@ -114,6 +115,9 @@
   -- `COMMIT` happens here
   {{ adapter.commit() }}
 
+  {% do saphanacloud__delta_merge(target_relation, load_result('main')['response'].rows_affected) %}
+  {% do saphanacloud__optimize_compression(target_relation, true) %}
+
   -- finally, drop the existing/backup relation after the commit
   {{ drop_relation_if_exists(backup_relation) }}
 
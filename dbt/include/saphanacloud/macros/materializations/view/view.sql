@@ -1,6 +1,4 @@
 {%- materialization view, adapter='saphanacloud' -%}
-  {% set relation = adapter.dispatch('list_relations_without_caching')(adapter.Relation.create(schema=this.schema)) %}
-
    {% set grant_config = config.get('grants') %}
    {%- set identifier = model['alias'] -%}
    {%- set backup_identifier = model['alias'] + '__dbt_backup' -%}
@@ -42,6 +40,7 @@
    {% call statement('main', fetch_result=True) %}
      {{ saphanacloud__create_or_replace_view(target_relation, sql) }}
    {% endcall %}
+   {% do adapter.cache_added(target_relation) %}
 
    {% do persist_docs(target_relation, model) %}
 
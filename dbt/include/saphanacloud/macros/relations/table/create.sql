@@ -52,7 +52,9 @@
             INSERT INTO 
             {{ relation }} 
             {%- set sql = get_select_subquery(sql) %}
-            ({{ sql }});
+            ({{ sql }}
+            )
+            {{ saphanacloud__hint_clause() }};
 
     {% endset %}
 
@@ -61,7 +63,8 @@
     {% set create_sql %}
       CREATE {{ temp_table }}{{ type }} TABLE {{ relation }} AS (
         {{ compiled_code }}
-      );
+      )
+      {{ saphanacloud__hint_clause() }};
     {% endset %}
     {% do return(create_sql) %}
   {% endif %}
@@ -22,6 +22,7 @@
       {{ saphanacloud__drop_table(old_relation) }}
     {%- endcall -%}
   {%- endif -%}
+  {%- do adapter.cache_dropped(old_relation) -%}
 {%- endif -%}
 
   -- Create or replace the view
@@ -33,7 +34,8 @@
     {%- endif %}
   AS (
     {{ sql }}
-  );
+  )
+  {{ saphanacloud__hint_clause() }};
  {% endset %}
 
   {{ return(create_sql) }}
@@ -67,7 +69,8 @@
   {%- endif %}
   as (
     {{ sql }}
-  );
+  )
+  {{ saphanacloud__hint_clause() }};
 {% endmacro %}
 
 
@@ -0,0 +1,81 @@
+import pytest
+from dbt.tests.util import run_dbt, run_dbt_and_capture
+
+models__cached_columns_sql = """
+{{ config(materialized='table') }}
+select 1 as id from dummy
+"""
+
+
+class TestColumnCache:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"cached_columns.sql": models__cached_columns_sql}
+
+    def test_columns_cached_until_ddl(self, project):
+        run_dbt(["run"])
+        adapter = project.adapter
+        relation = adapter.Relation.create(
+            database=project.database, schema=project.test_schema, identifier="cached_columns"
+        )
+
+        with adapter.connection_named("__test"):
+            before = adapter.column_cache.stats()
+            assert len(adapter.get_columns_in_relation(relation)) == 1
+            assert len(adapter.get_columns_in_relation(relation)) == 1
+            stats = adapter.column_cache.stats()
+            assert stats["misses"] == before["misses"] + 1
+            assert stats["hits"] == before["hits"] + 1
+
+            # adding a column drops the cached columns of the table
+            adapter.execute_macro(
+                "saphanacloud__alter_relation_add_remove_columns",
+                kwargs={
+                    "relation": relation,
+                    "add_columns": [adapter.Column("added", "INTEGER")],
+                    "remove_columns": None,
+                },
+            )
+            assert len(adapter.get_columns_in_relation(relation)) == 2
+            assert adapter.column_cache.stats()["misses"] == before["misses"] + 2
+
+
+class TestPrefetchColumns:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"cached_columns.sql": models__cached_columns_sql}
+
+    @pytest.fixture(scope="class")
+    def profiles_config_update(self, dbt_profile_target):
+        return {
+            "test": {
+                "outputs": {"default": {**dbt_profile_target, "prefetch_columns": True}},
+                "target": "default",
+            },
+        }
+
+    def test_columns_prefetched(self, project):
+        run_dbt(["run"])
+
+        # the table exists now and its columns are read at the start of the run
+        _, logs = run_dbt_and_capture(["--debug", "run"])
+        assert "Prefetched the columns of 1 relations into the column cache" in logs
+
+
+class TestColumnCacheCaseSensitive:
+    def test_differently_cased_tables(self, project):
+        project.run_sql(f'create table "{project.test_schema}"."orders" (id integer)')
+        project.run_sql(f'create table "{project.test_schema}"."ORDERS" (id integer, amount integer)')
+        adapter = project.adapter
+
+        def columns(identifier):
+            relation = adapter.Relation.create(
+                database=project.database, schema=project.test_schema, identifier=identifier
+            )
+            return [column.name.lower() for column in adapter.get_columns_in_relation(relation)]
+
+        # quoted names are case-sensitive, each table keeps its own columns
+        with adapter.connection_named("__test"):
+            assert columns("orders") == ["id"]
+            assert columns("ORDERS") == ["id", "amount"]
+            assert columns("orders") == ["id"]
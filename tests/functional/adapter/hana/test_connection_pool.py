@@ -0,0 +1,380 @@
+import pytest
+from dbt.tests.util import run_dbt, run_dbt_and_capture
+
+from dbt.adapters.saphanacloud.pool import get_pool_stats
+
+models__first_sql = """
+select 1 as id from dummy
+"""
+
+models__second_sql = """
+select id from {{ ref('first') }}
+"""
+
+
+class BaseConnectionSettings:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "first.sql": models__first_sql,
+            "second.sql": models__second_sql,
+        }
+
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {}
+
+    @pytest.fixture(scope="class")
+    def profiles_config_update(self, dbt_profile_target, profile_overrides):
+        return {
+            "test": {
+                "outputs": {"default": {**dbt_profile_target, **profile_overrides}},
+                "target": "default",
+            },
+        }
+
+
+class TestConnectionPool(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {"pool_size": 2, "pool_idle_timeout": 60}
+
+    def test_connections_are_reused(self, project):
+        run_dbt(["run"])
+        hits = get_pool_stats()["hits"]
+
+        # a second invocation in the same process reuses the pooled connections
+        results = run_dbt(["run"])
+        assert len(results) == 2
+        assert get_pool_stats()["hits"] > hits
+        assert get_pool_stats()["idle"] <= 2
+
+
+class TestPooledConnectionValidation(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {"pool_size": 2, "pool_validate_after": 0}
+
+    def test_stale_connections_are_probed(self, project):
+        run_dbt(["run"])
+        _, logs = run_dbt_and_capture(["--debug", "run"])
+        assert "Reusing pooled connection" in logs
+
+
+class TestNoProbeOnOpen(BaseConnectionSettings):
+    def test_no_probe_query(self, project):
+        _, logs = run_dbt_and_capture(["--debug", "run"])
+        assert "Testing connection with" not in logs
+
+
+class TestConnectionWarmup(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {"threads": 2, "warmup_connections": True}
+
+    def test_warmed_up_connections_are_used(self, project):
+        hits = get_pool_stats()["hits"]
+        _, logs = run_dbt_and_capture(["--debug", "run"])
+        assert "Reusing pooled connection" in logs
+        assert get_pool_stats()["hits"] > hits
+
+
+class TestConnectionWarmupLimits(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {"threads": 4, "warmup_connections": True, "pool_size": 1}
+
+    def test_no_warmup_without_connection(self, project):
+        _, logs = run_dbt_and_capture(["--debug", "ls"])
+        assert "Warming up" not in logs
+
+    def test_warmup_capped_at_pool_size(self, project):
+        _, logs = run_dbt_and_capture(["--debug", "run"])
+        assert "Warming up 1 connections" in logs
+        assert get_pool_stats()["idle"] <= 1
+
+
+class TestDriverNetworkOptions(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {
+            "connect_timeout": 30,
+            "compress": True,
+            "packetSize": 1048576,
+            "prefetch": True,
+            "communicationTimeout": 60000,
+            "arraysize": 500,
+        }
+
+    def test_run_with_network_options(self, project):
+        results = run_dbt(["run"])
+        assert len(results) == 2
+
+        credentials = project.adapter.config.credentials
+        assert credentials.packet_size == 1048576
+        assert credentials.driver_options()["compress"] == "true"
+
+
+seeds__numbers_csv = "\n".join(["id,name"] + [f"{i},name {i}" for i in range(1, 31)])
+
+
+class TestPreparedStatementCache(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"numbers.csv": seeds__numbers_csv}
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"seeds": {"batch_size": 10}}
+
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {"statement_cache_size": 4}
+
+    def test_insert_is_prepared_once(self, project):
+        _, logs = run_dbt_and_capture(["--debug", "seed"])
+        # three batches of the same insert: prepared once, reused twice
+        assert "2 hits, 1 misses (67% hit rate)" in logs
+
+
+class TestCursorsClosedAfterUse(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {"max_open_cursors": 1}
+
+    def test_cursors_closed_after_use(self, project):
+        _, logs = run_dbt_and_capture(["--debug", "run"])
+        # every statement's cursor is closed once its result is read, so
+        # neither the limit is exceeded nor cursors are left for the release
+        assert "cursors open" not in logs
+        assert "cursors left open" not in logs
+
+
+models__client_info_sql = """
+{{ config(materialized='table') }}
+select session_context('APPLICATION') as application,
+       session_context('DBT_NODE_ID') as node_id
+from dummy
+"""
+
+
+class TestSessionClientInfo(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"client_info.sql": models__client_info_sql}
+
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {"application": "dbt-tests"}
+
+    def test_session_tagged_with_node(self, project):
+        run_dbt(["run"])
+        row = project.run_sql(
+            f'select application, node_id from "{project.test_schema}"."client_info"',
+            fetch="one",
+        )
+        assert row[0] == "dbt-tests"
+        assert row[1] == "model.test.client_info"
+
+
+models__heavy_sql = """
+{{ config(materialized='table', workload_class='DBT_TEST_HEAVY') }}
+select session_context('APPLICATIONCOMPONENT') as application_component,
+       (select max(workload_class_name) from m_service_threads
+        where connection_id = current_connection) as workload_class
+from dummy
+"""
+
+models__light_sql = """
+{{ config(materialized='table') }}
+select session_context('APPLICATIONCOMPONENT') as application_component,
+       (select max(workload_class_name) from m_service_threads
+        where connection_id = current_connection) as workload_class
+from {{ ref('heavy') }}
+"""
+
+
+class TestWorkloadClass(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "heavy.sql": models__heavy_sql,
+            "light.sql": models__light_sql,
+        }
+
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {"workload_class": "DBT_TEST_DEFAULT", "pool_size": 1}
+
+    @pytest.fixture(scope="class", autouse=True)
+    def workload_classes(self, project):
+        # Requires the WORKLOAD ADMIN privilege
+        for name in ("DBT_TEST_HEAVY", "DBT_TEST_DEFAULT"):
+            project.run_sql(f"create workload class \"{name}\" set 'PRIORITY' = '5'")
+            project.run_sql(
+                f"create workload mapping \"{name}_MAPPING\" workload class \"{name}\" "
+                f"set 'APPLICATION COMPONENT NAME' = '{name}'"
+            )
+        yield
+        for name in ("DBT_TEST_HEAVY", "DBT_TEST_DEFAULT"):
+            project.run_sql(f"drop workload mapping \"{name}_MAPPING\"")
+            project.run_sql(f"drop workload class \"{name}\"")
+
+    def get_workload_class(self, project, table_name):
+        return tuple(project.run_sql(
+            f'select application_component, workload_class from "{project.test_schema}"."{table_name}"',
+            fetch="one",
+        ))
+
+    def test_model_workload_class(self, project):
+        run_dbt(["run", "--threads", "1"])
+        # the mapping puts the model's statement into its workload class
+        assert self.get_workload_class(project, "heavy") == ("DBT_TEST_HEAVY", "DBT_TEST_HEAVY")
+        # the next model runs in the profile's workload class again
+        assert self.get_workload_class(project, "light") == ("DBT_TEST_DEFAULT", "DBT_TEST_DEFAULT")
+
+
+models__limited_sql = """
+{{ config(materialized='table', statement_memory_limit=2, statement_thread_limit=4) }}
+select session_context('STATEMENT MEMORY LIMIT') as memory_limit,
+       session_context('STATEMENT THREAD LIMIT') as thread_limit
+from dummy
+"""
+
+models__unlimited_sql = """
+{{ config(materialized='table') }}
+select session_context('STATEMENT MEMORY LIMIT') as memory_limit
+from {{ ref('limited') }}
+"""
+
+models__invalid_limit_sql = """
+{{ config(materialized='table', statement_thread_limit=0) }}
+select 1 as id from dummy
+"""
+
+
+class TestStatementLimits(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "limited.sql": models__limited_sql,
+            "unlimited.sql": models__unlimited_sql,
+        }
+
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {"pool_size": 1}
+
+    def test_statement_limits(self, project):
+        results = run_dbt(["run", "--threads", "1"])
+        limited = next(result for result in results if result.node.name == "limited")
+        # the peak memory of the main statement is reported with it
+        assert limited.adapter_response["server_memory_usage"] >= 0
+
+        row = project.run_sql(
+            f'select memory_limit, thread_limit from "{project.test_schema}"."limited"',
+            fetch="one",
+        )
+        assert tuple(row) == ("2", "4")
+
+        # the limits are unset once the model's main statement is done
+        row = project.run_sql(
+            f'select memory_limit from "{project.test_schema}"."unlimited"',
+            fetch="one",
+        )
+        assert row[0] is None
+
+
+models__exceeds_limit_sql = """
+{{ config(materialized='table', statement_memory_limit=0.001) }}
+select count(distinct a.object_name || b.object_name) as pairs
+from objects a, objects b
+"""
+
+seeds__limited_csv = "id,name\n1,one\n2,two"
+
+snapshots__limited_sql = """
+{% snapshot limited_snapshot %}
+{{ config(target_schema=schema, unique_key='id', strategy='check', check_cols='all',
+          statement_thread_limit=2) }}
+select 1 as id, session_context('STATEMENT THREAD LIMIT') as thread_limit from dummy
+{% endsnapshot %}
+"""
+
+
+class TestStatementLimitEnforced(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"exceeds_limit.sql": models__exceeds_limit_sql}
+
+    def test_statement_exceeding_limit_fails(self, project):
+        results = run_dbt(["run"], expect_pass=False)
+        assert "memory" in results[0].message.lower()
+
+
+class TestStatementLimitsOfSeedsAndSnapshots(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"limited_seed.csv": seeds__limited_csv}
+
+    @pytest.fixture(scope="class")
+    def snapshots(self):
+        return {"limited_snapshot.sql": snapshots__limited_sql}
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"seeds": {"statement_thread_limit": 2}}
+
+    def test_seed_and_snapshot_limits(self, project):
+        run_dbt(["seed"])
+        run_dbt(["snapshot"])
+        row = project.run_sql(
+            f'select thread_limit from "{project.test_schema}"."limited_snapshot"',
+            fetch="one",
+        )
+        assert row[0] == "2"
+
+
+class TestInvalidStatementLimit(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"invalid_limit.sql": models__invalid_limit_sql}
+
+    def test_invalid_statement_limit(self, project):
+        results = run_dbt(["run"], expect_pass=False)
+        assert "statement_thread_limit" in results[0].message
+
+
+models__leak_sql = """
+{{ config(materialized='table', pre_hook=["set 'DBT_TEST_LEAK' = 'leaked'", 'set schema "SYS"']) }}
+select 1 as id from dummy
+"""
+
+models__session_state_sql = """
+{{ config(materialized='table') }}
+select session_context('DBT_TEST_LEAK') as leaked, current_schema as schema_name from dummy
+"""
+
+
+class TestPooledSessionReset(BaseConnectionSettings):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "leak.sql": models__leak_sql,
+            "session_state.sql": models__session_state_sql,
+        }
+
+    @pytest.fixture(scope="class")
+    def profile_overrides(self):
+        return {"pool_size": 1}
+
+    def test_session_reset_on_release(self, project):
+        run_dbt(["run", "--threads", "1", "--select", "leak"])
+        # the pooled connection is reset before the next invocation reuses it
+        run_dbt(["run", "--threads", "1", "--select", "session_state"])
+        row = project.run_sql(
+            f'select leaked, schema_name from "{project.test_schema}"."session_state"',
+            fetch="one",
+        )
+        assert row[0] is None
+        assert row[1] == project.adapter.config.credentials.schema
@@ -0,0 +1,106 @@
+import pytest
+from dbt.tests.util import run_dbt, run_dbt_and_capture
+
+models__merged_incremental_sql = """
+{{ config(materialized='incremental', unique_key='id', delta_merge='always') }}
+select generated_period_start as id from series_generate_integer(1, 0, 100)
+"""
+
+models__smart_table_sql = """
+{{ config(materialized='table', delta_merge='smart') }}
+select 1 as id from dummy
+"""
+
+models__threshold_table_sql = """
+{{ config(materialized='table', delta_merge='auto', delta_merge_threshold=1000) }}
+select generated_period_start as id from series_generate_integer(1, 0, 10)
+"""
+
+models__invalid_mode_sql = """
+{{ config(materialized='table', delta_merge='sometimes') }}
+select 1 as id from dummy
+"""
+
+seeds__numbers_csv = "id\n" + "\n".join(str(i) for i in range(20))
+
+
+class TestDeltaMerge:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "merged_incremental.sql": models__merged_incremental_sql,
+            "smart_table.sql": models__smart_table_sql,
+            "threshold_table.sql": models__threshold_table_sql,
+        }
+
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"numbers.csv": seeds__numbers_csv}
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"seeds": {"delta_merge": "always"}}
+
+    def test_delta_merge(self, project):
+        _, logs = run_dbt_and_capture(["--debug", "run"])
+        assert "SMART_MERGE" in logs
+        assert "rows are below the threshold of 1000" in logs
+
+        # loading into the existing table merges explicitly and leaves
+        # automerge alone, so a failed load can't leave it disabled
+        _, logs = run_dbt_and_capture(["--debug", "run", "--select", "merged_incremental"])
+        assert "automerge" not in logs
+        assert "merge delta of" in logs
+
+        _, logs = run_dbt_and_capture(["--debug", "seed"])
+        assert "merge delta of" in logs
+        _, logs = run_dbt_and_capture(["--debug", "seed"])
+        assert "automerge" not in logs
+
+        auto_merge = project.run_sql(
+            f"""select auto_merge_on from sys.tables
+                where schema_name = '{project.test_schema}' and table_name = 'merged_incremental'""",
+            fetch="one",
+        )
+        assert auto_merge[0] == "TRUE"
+
+
+class TestInvalidDeltaMerge:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"invalid_mode.sql": models__invalid_mode_sql}
+
+    def test_invalid_delta_merge(self, project):
+        results = run_dbt(["run"], expect_pass=False)
+        assert "delta_merge" in results[0].message
+
+
+models__compressed_table_sql = """
+{{ config(materialized='table', delta_merge='always', optimize_compression=true) }}
+select generated_period_start as id, 'constant' as label from series_generate_integer(1, 0, 1000)
+"""
+
+models__compressed_incremental_sql = """
+{{ config(materialized='incremental', optimize_compression=true, optimize_compression_threshold=5000) }}
+select generated_period_start as id from series_generate_integer(1, 0, 1000)
+"""
+
+
+class TestOptimizeCompression:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "compressed_table.sql": models__compressed_table_sql,
+            "compressed_incremental.sql": models__compressed_incremental_sql,
+        }
+
+    def test_optimize_compression(self, project):
+        _, logs = run_dbt_and_capture(["--debug", "run"])
+        assert "OPTIMIZE_COMPRESSION" in logs
+        # the compression is optimized after the delta merge
+        assert logs.index("merge delta of") < logs.index("OPTIMIZE_COMPRESSION")
+        assert "Optimized compression of" in logs
+
+        # a small incremental load is left to HANA's background optimization
+        _, logs = run_dbt_and_capture(["--debug", "run", "--select", "compressed_incremental"])
+        assert "rows are below the threshold of 5000" in logs
@@ -0,0 +1,112 @@
+import re
+
+import pytest
+from dbt.tests.util import run_dbt, run_dbt_and_capture
+
+models__hinted_table_sql = """
+{{ config(materialized='table', hints=['NO_CS_JOIN', 'MAX_CONCURRENCY(2)']) }}
+select 1 as id, 'a' as name from dummy
+"""
+
+models__hinted_view_sql = """
+{{ config(materialized='view', hints='USE_OLAP_PLAN') }}
+select id, name from {{ ref('hinted_table') }}
+"""
+
+models__hinted_incremental_sql = """
+{{ config(materialized='incremental', unique_key='id', hints=['NO_CS_JOIN']) }}
+select id, name from {{ ref('hinted_table') }}
+"""
+
+models__invalid_hint_sql = """
+{{ config(materialized='table', hints=['NO_CS_JOIN; drop table x']) }}
+select 1 as id from dummy
+"""
+
+models__unbalanced_hint_sql = """
+{{ config(materialized='table', hints=['MAX_CONCURRENCY(1)) -- ']) }}
+select 1 as id from dummy
+"""
+
+
+class TestHints:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "hinted_table.sql": models__hinted_table_sql,
+            "hinted_view.sql": models__hinted_view_sql,
+            "hinted_incremental.sql": models__hinted_incremental_sql,
+        }
+
+    def test_hints(self, project):
+        results, logs = run_dbt_and_capture(["--debug", "run"])
+        assert len(results) == 3
+        assert "WITH HINT(NO_CS_JOIN, MAX_CONCURRENCY(2))" in logs
+        assert "WITH HINT(USE_OLAP_PLAN)" in logs
+
+        # the hint clause ends the statement, it is never nested in a subquery
+        assert re.search(r"\)\s*WITH HINT\(NO_CS_JOIN, MAX_CONCURRENCY\(2\)\);", logs)
+
+        # the incremental run hints its merge
+        _, logs = run_dbt_and_capture(["--debug", "run", "--select", "hinted_incremental"])
+        assert re.search(r"\)\s*WITH HINT\(NO_CS_JOIN\);", logs)
+
+        row = project.run_sql(
+            f'select count(*) from "{project.test_schema}"."hinted_incremental"',
+            fetch="one",
+        )
+        assert row[0] == 1
+
+
+models__hinted_partitioned_sql = """
+{{ config(
+    materialized='incremental',
+    unique_key=['ID'],
+    hints=['NO_CS_JOIN'],
+    query_partitions=[{
+        'column': 'CATEGORY',
+        'type': 'list',
+        'partitions': ['train', 'car'],
+        'default_partition_required': False,
+    }],
+) }}
+select 1 as ID, 'car' as CATEGORY from dummy
+union all
+select 2 as ID, 'train' as CATEGORY from dummy
+"""
+
+
+class TestHintsPartitionedIncremental:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"hinted_partitioned.sql": models__hinted_partitioned_sql}
+
+    def test_partitioned_hints(self, project):
+        # the empty table is created unhinted, each partition insert is hinted
+        _, logs = run_dbt_and_capture(["--debug", "run"])
+        assert "WITH NO DATA WITHOUT CONSTRAINT;" in logs
+        assert "WITH HINT(NO_CS_JOIN) WITH NO DATA" not in logs
+        assert re.search(r"\)\s*WITH HINT\(NO_CS_JOIN\)", logs)
+
+        # the incremental run loads the partitions into a temp table first
+        run_dbt(["run"])
+        row = project.run_sql(
+            f'select count(*) from "{project.test_schema}"."hinted_partitioned"',
+            fetch="one",
+        )
+        assert row[0] == 2
+
+
+class TestInvalidHint:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "invalid_hint.sql": models__invalid_hint_sql,
+            "unbalanced_hint.sql": models__unbalanced_hint_sql,
+        }
+
+    def test_invalid_hint(self, project):
+        results = run_dbt(["run"], expect_pass=False)
+        assert len(results) == 2
+        for result in results:
+            assert "Invalid hint" in result.message
@@ -0,0 +1,56 @@
+import pytest
+from dbt.tests.util import run_dbt, run_dbt_and_capture
+
+macros__check_results_sql = """
+{% macro check_results() %}
+  {% set sql %}
+    select generated_period_start as id,
+           cast(generated_period_start / 4 as decimal(10, 2)) as amount,
+           add_days(to_date('2024-01-01'), generated_period_start) as created_on,
+           case when mod(generated_period_start, 2) = 0 then null else 'odd' end as label
+    from series_generate_integer(1, 0, 2500)
+  {% endset %}
+
+  {% set table = run_query(sql) %}
+  {{ log("rows: " ~ table.rows | length, info=true) }}
+  {{ log("last: " ~ table.rows[-1][0] ~ "," ~ table.rows[-1][1] ~ "," ~ table.rows[-1][2], info=true) }}
+
+  {% set chunks = [] %}
+  {% for chunk in adapter.iter_query_results(sql, 1000) %}
+    {% do chunks.append(chunk | length) %}
+  {% endfor %}
+  {{ log("chunks: " ~ chunks | join(','), info=true) }}
+{% endmacro %}
+"""
+
+
+class TestColumnarResults:
+    @pytest.fixture(scope="class")
+    def macros(self):
+        return {"check_results.sql": macros__check_results_sql}
+
+    def test_columnar_results(self, project):
+        _, logs = run_dbt_and_capture(["run-operation", "check_results"])
+        assert "rows: 2500" in logs
+        assert "last: 2499,624.75,2030-11-04" in logs
+        # iter_query_results hands out the same rows in chunks
+        assert "chunks: 1000,1000,500" in logs
+
+
+models__timed_sql = """
+{{ config(materialized='table') }}
+select generated_period_start as id from series_generate_integer(1, 0, 100)
+"""
+
+
+class TestStatementMetrics:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"timed.sql": models__timed_sql}
+
+    def test_statement_metrics(self, project):
+        results = run_dbt(["run"])
+        response = results[0].adapter_response
+        assert 0 <= response["server_processing_time"] <= response["execution_time"]
+        assert response["server_cpu_time"] >= 0
+        assert response["server_memory_usage"] >= 0
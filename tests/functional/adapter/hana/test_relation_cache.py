@@ -0,0 +1,150 @@
+import pytest
+from dbt.exceptions import DbtRuntimeError
+from dbt.tests.util import run_dbt, run_dbt_and_capture
+
+models__first_sql = """
+{{ config(materialized='table') }}
+select 1 as id from dummy
+"""
+
+models__second_sql = """
+{{ config(materialized='view', schema='other') }}
+select id from {{ ref('first') }}
+"""
+
+
+class TestRelationCacheSingleQuery:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "first.sql": models__first_sql,
+            "second.sql": models__second_sql,
+        }
+
+    @pytest.fixture(scope="class", autouse=True)
+    def drop_other_schema(self, project):
+        yield
+        relation = project.adapter.Relation.create(
+            database=project.database, schema=f"{project.test_schema}_other"
+        )
+        with project.adapter.connection_named("__test"):
+            project.adapter.drop_schema(relation)
+
+    def test_relations_cached_in_one_query(self, project):
+        run_dbt(["run"])
+
+        # both schemas are listed by a single query and the relations created
+        # by the first run are found in the cache
+        results, logs = run_dbt_and_capture(["--debug", "run"])
+        assert len(results) == 2
+        assert logs.count("SCHEMA_NAME IN (?, ?)") == 2
+
+
+models__table_sql = """
+{{ config(materialized='table') }}
+select 1 as id from dummy
+"""
+
+models__view_sql = """
+{{ config(materialized='view') }}
+select id from {{ ref('cached_table') }}
+"""
+
+
+class TestGetRelationFromCache:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "cached_table.sql": models__table_sql,
+            "cached_view.sql": models__view_sql,
+        }
+
+    def test_existing_relations_from_cache(self, project):
+        run_dbt(["run"])
+
+        # the existing table and view are replaced without looking them up
+        # one by one
+        results, logs = run_dbt_and_capture(["--debug", "run"])
+        assert len(results) == 2
+        assert "LOWER(VIEW_NAME)" not in logs
+
+        relation = project.adapter.Relation.create(
+            database=project.database, schema=project.test_schema, identifier="cached_view"
+        )
+        with project.adapter.connection_named("__test"):
+            found = project.adapter.get_relation(
+                relation.database, relation.schema, relation.identifier
+            )
+        assert found is not None
+        assert found.is_view
+
+    def test_lookup_outside_cache(self, project, monkeypatch):
+        with project.adapter.connection_named("__test"):
+            # a relation which doesn't exist is no error
+            assert project.adapter.get_relation(project.database, "DBT_NO_SUCH_SCHEMA", "missing") is None
+
+            # names are matched case-insensitively
+            schema = f"{project.test_schema}_lookup"
+            project.run_sql(f'create schema "{schema}"')
+            try:
+                project.run_sql(f'create table "{schema}"."MyTable" (id integer)')
+                found = project.adapter.get_relation(project.database, schema, "mytable")
+                assert found is not None
+                assert found.identifier == "MyTable"
+            finally:
+                project.run_sql(f'drop schema "{schema}" cascade')
+
+            # failing metadata queries aren't swallowed
+            def fail(*args, **kwargs):
+                raise DbtRuntimeError("metadata query failed")
+
+            monkeypatch.setattr(project.adapter.connections, "add_query", fail)
+            with pytest.raises(DbtRuntimeError, match="metadata query failed"):
+                project.adapter.get_relation(project.database, "DBT_NO_SUCH_SCHEMA", "missing")
+
+
+models__mixed_case_sql = """
+{{ config(materialized='table', alias='MixedCase_table') }}
+select 1 as id from dummy
+"""
+
+
+class TestRelationCacheConsistency:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "cached_table.sql": models__table_sql,
+            "cached_view.sql": models__view_sql,
+            "mixed_case.sql": models__mixed_case_sql,
+        }
+
+    def test_cache_matches_database(self, project):
+        run_dbt(["run"])
+
+        # the table and view are swapped again and the cache is checked
+        # against the database at the end of the debug run
+        _, logs = run_dbt_and_capture(["--debug", "run"])
+        assert "Relation cache mismatch" not in logs
+        assert "0 mismatches" in logs
+
+
+class TestDropRelationKeepsCacheOnFailure:
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"cached_table.sql": models__table_sql}
+
+    def test_failed_drop_stays_cached(self, project, monkeypatch):
+        run_dbt(["run"])
+        adapter = project.adapter
+        relation = adapter.Relation.create(
+            database=project.database, schema=project.test_schema, identifier="cached_table", type="table"
+        )
+        adapter.cache.add(relation)
+
+        def fail(*args, **kwargs):
+            raise DbtRuntimeError("drop failed")
+
+        monkeypatch.setattr(adapter, "execute_macro", fail)
+        with pytest.raises(DbtRuntimeError):
+            adapter.drop_relation(relation)
+        assert adapter.cache.get_relations(project.database, project.test_schema)
@@ -0,0 +1,319 @@
+import pytest
+from dbt.tests.util import run_dbt, run_dbt_and_capture
+
+seeds__countries_csv = "\n".join(
+    ["id,country_code,country_name,population"]
+    + [f"{i},C{i:03d},Country {i},{i * 1000}" for i in range(1, 26)]
+)
+
+
+class BaseSeedLoading:
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"countries.csv": seeds__countries_csv}
+
+    def get_row_count(self, project, table_name):
+        query = f'SELECT COUNT(*) FROM "{project.test_schema}"."{table_name}"'
+        return project.run_sql(query, fetch="one")[0]
+
+
+class TestSeedBatchSize(BaseSeedLoading):
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {
+            "seeds": {
+                "quote_columns": False,
+                "batch_size": 10,
+            },
+        }
+
+    def test_seed_batches(self, project):
+        results, logs = run_dbt_and_capture(["--debug", "seed"])
+        assert len(results) == 1
+        assert self.get_row_count(project, "countries") == 25
+        # the rows HANA reported as inserted, summed over the batches
+        assert results[0].adapter_response["rows_affected"] == 25
+
+        # 25 rows with a batch size of 10 are sent in three statements
+        assert logs.count("-- batch of 10 rows") == 2
+        assert logs.count("-- batch of 5 rows") == 1
+
+        row = project.run_sql(
+            f'SELECT country_name, population FROM "{project.test_schema}"."countries" WHERE id = 7',
+            fetch="one",
+        )
+        assert row[0] == "Country 7"
+        assert row[1] == 7000
+
+    def test_seed_reload(self, project):
+        run_dbt(["seed"])
+        run_dbt(["seed"])
+        assert self.get_row_count(project, "countries") == 25
+
+
+class TestSeedInvalidBatchSize(BaseSeedLoading):
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {
+            "seeds": {
+                "batch_size": 0,
+            },
+        }
+
+    def test_invalid_batch_size(self, project):
+        results = run_dbt(["seed"], expect_pass=False)
+        assert "batch_size" in results[0].message
+
+
+class TestSeedStreaming(BaseSeedLoading):
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {
+            "seeds": {
+                "quote_columns": False,
+                "streaming": True,
+                "batch_size": 10,
+            },
+        }
+
+    def test_seed_streaming(self, project):
+        results, logs = run_dbt_and_capture(["--debug", "seed"])
+        assert len(results) == 1
+        assert self.get_row_count(project, "countries") == 25
+        assert results[0].adapter_response["rows_affected"] == 25
+
+        # the file is streamed in chunks of batch_size rows
+        assert logs.count("-- batch of 10 rows") == 2
+        assert logs.count("-- batch of 5 rows") == 1
+
+        row = project.run_sql(
+            f'SELECT country_name, population FROM "{project.test_schema}"."countries" WHERE id = 7',
+            fetch="one",
+        )
+        assert row[0] == "Country 7"
+        assert row[1] == 7000
+
+    def test_seed_streaming_reload(self, project):
+        run_dbt(["seed"])
+        run_dbt(["seed", "--full-refresh"])
+        assert self.get_row_count(project, "countries") == 25
+
+
+seeds__typed_csv = """id,code,amount,big_number,label,created_on
+1,A1,10.5,3000000000,Zürich,2024-01-01
+2,B22,-3.25,1,Berlin,2024-01-02
+3,C333,100,,Paris,
+"""
+
+
+class TestSeedTypeInference:
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"typed.csv": seeds__typed_csv}
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {
+            "seeds": {
+                "quote_columns": False,
+                "column_types": {"code": "NVARCHAR(10)"},
+            },
+        }
+
+    def get_column_types(self, project):
+        query = f"""
+            SELECT COLUMN_NAME, DATA_TYPE_NAME, LENGTH, SCALE
+            FROM SYS.TABLE_COLUMNS
+            WHERE SCHEMA_NAME = '{project.test_schema}' AND TABLE_NAME = 'typed'
+        """
+        return {
+            row[0].lower(): (row[1], row[2], row[3])
+            for row in project.run_sql(query, fetch="all")
+        }
+
+    def test_seed_types(self, project):
+        run_dbt(["seed"])
+        column_types = self.get_column_types(project)
+
+        assert column_types["id"][0] == "SMALLINT"
+        assert column_types["amount"] == ("DECIMAL", 5, 2)
+        assert column_types["big_number"][0] == "BIGINT"
+        assert column_types["label"][:2] == ("NVARCHAR", 16)
+        assert column_types["created_on"][0] == "DATE"
+        # column_types overrides win over the inferred type
+        assert column_types["code"][:2] == ("NVARCHAR", 10)
+
+
+class TestSeedSkipUnchanged(BaseSeedLoading):
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {
+            "seeds": {
+                "quote_columns": False,
+                "skip_unchanged": True,
+            },
+        }
+
+    def test_seed_skip_unchanged(self, project):
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response["rows_affected"] == 25
+
+        # rows added outside of dbt stay, as the unchanged file is not reloaded
+        project.run_sql(
+            f"INSERT INTO \"{project.test_schema}\".\"countries\" VALUES (26, 'C026', 'Country 26', 26000)"
+        )
+        results, logs = run_dbt_and_capture(["--debug", "seed"])
+        assert results[0].adapter_response["_message"] == "UNCHANGED 0"
+        assert self.get_row_count(project, "countries") == 26
+        # only the recorded hash is read, the table and its comment are left alone
+        assert "limit 10" not in logs
+        assert "comment on table" not in logs
+
+        # a full refresh always reloads the file
+        run_dbt(["seed", "--full-refresh"])
+        assert self.get_row_count(project, "countries") == 25
+
+    def test_seed_reload_on_change(self, project):
+        run_dbt(["seed"])
+        with open(project.project_root / "seeds" / "countries.csv", "a") as fp:
+            fp.write("\n26,C026,Country 26,26000")
+
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response["rows_affected"] == 26
+        assert self.get_row_count(project, "countries") == 26
+
+    def test_seed_hash_keeps_table_comment(self, project):
+        run_dbt(["seed"])
+        project.run_sql(f'COMMENT ON TABLE "{project.test_schema}"."countries" IS \'Country list\'')
+
+        # the comment set outside of dbt stays next to the recorded hash
+        with open(project.project_root / "seeds" / "countries.csv", "a") as fp:
+            fp.write("\n27,C027,Country 27,27000")
+        run_dbt(["seed"])
+        comment = project.run_sql(
+            f"SELECT COMMENTS FROM SYS.TABLES WHERE SCHEMA_NAME = '{project.test_schema}' AND TABLE_NAME = 'countries'",
+            fetch="one",
+        )[0]
+        assert comment.startswith("Country list [dbt seed hash: ")
+
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response["_message"] == "UNCHANGED 0"
+
+
+class TestSeedMergeLoad(BaseSeedLoading):
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {
+            "seeds": {
+                "quote_columns": False,
+                "load_strategy": "merge",
+                "unique_key": "id",
+            },
+        }
+
+    def test_seed_merge(self, project):
+        run_dbt(["seed"])
+        assert self.get_row_count(project, "countries") == 25
+
+        # one row changed, one removed and one added: three rows are written
+        changed_csv = "\n".join(
+            ["id,country_code,country_name,population"]
+            + [f"{i},C{i:03d},Country {i},{i * 1000}" for i in range(1, 24)]
+            + ["24,C024,Renamed 24,24000", "26,C026,Country 26,26000"]
+        )
+        with open(project.project_root / "seeds" / "countries.csv", "w") as fp:
+            fp.write(changed_csv)
+
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response["rows_affected"] == 3
+        assert self.get_row_count(project, "countries") == 25
+
+        rows = project.run_sql(
+            f'SELECT id, country_name FROM "{project.test_schema}"."countries" WHERE id >= 24 ORDER BY id',
+            fetch="all",
+        )
+        assert [tuple(row) for row in rows] == [(24, "Renamed 24"), (26, "Country 26")]
+
+    def test_seed_merge_widens_columns(self, project):
+        with open(project.project_root / "seeds" / "countries.csv", "w") as fp:
+            fp.write(seeds__countries_csv)
+        run_dbt(["seed", "--full-refresh"])
+
+        # the new values outgrow the SMALLINT population and VARCHAR(16) name
+        # columns, which are widened instead of reloading the whole table
+        widened_csv = "\n".join(
+            ["id,country_code,country_name,population"]
+            + [f"{i},C{i:03d},Country {i},{i * 1000}" for i in range(1, 25)]
+            + ["25,C025,Country with a much longer name,100000"]
+        )
+        with open(project.project_root / "seeds" / "countries.csv", "w") as fp:
+            fp.write(widened_csv)
+
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response["rows_affected"] == 1
+
+        column_types = {
+            row[0].lower(): (row[1], row[2])
+            for row in project.run_sql(
+                f"""
+                SELECT COLUMN_NAME, DATA_TYPE_NAME, LENGTH FROM SYS.TABLE_COLUMNS
+                WHERE SCHEMA_NAME = '{project.test_schema}' AND TABLE_NAME = 'countries'
+                """,
+                fetch="all",
+            )
+        }
+        assert column_types["population"][0] == "INTEGER"
+        assert column_types["country_name"] == ("VARCHAR", 64)
+        row = project.run_sql(
+            f'SELECT country_name, population FROM "{project.test_schema}"."countries" WHERE id = 25',
+            fetch="one",
+        )
+        assert tuple(row) == ("Country with a much longer name", 100000)
+
+
+class TestSeedMergeLoadQuotedColumns(BaseSeedLoading):
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        # the lower case columns are created quoted by default
+        return {"seeds": {"load_strategy": "merge", "unique_key": "id"}}
+
+    def test_seed_merge_quoted_columns(self, project):
+        run_dbt(["seed"])
+
+        changed_csv = "\n".join(
+            ["id,country_code,country_name,population"]
+            + [f"{i},C{i:03d},Country {i},{i * 1000}" for i in range(1, 25)]
+            + ["25,C025,Renamed 25,25000"]
+        )
+        with open(project.project_root / "seeds" / "countries.csv", "w") as fp:
+            fp.write(changed_csv)
+
+        results = run_dbt(["seed"])
+        assert results[0].adapter_response["rows_affected"] == 1
+        row = project.run_sql(
+            f'SELECT "country_name" FROM "{project.test_schema}"."countries" WHERE "id" = 25',
+            fetch="one",
+        )
+        assert row[0] == "Renamed 25"
+
+
+class TestSeedParallelLoad(BaseSeedLoading):
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {
+            "seeds": {
+                "quote_columns": False,
+                "batch_size": 5,
+                "load_threads": 3,
+            },
+        }
+
+    def test_seed_parallel_load(self, project):
+        results, logs = run_dbt_and_capture(["--debug", "seed"])
+        assert results[0].adapter_response["rows_affected"] == 25
+        assert self.get_row_count(project, "countries") == 25
+        assert logs.count("-- batch of 5 rows") == 5
+        assert "seed.test.countries_load_1" in logs
+
+        run_dbt(["seed"])
+        assert self.get_row_count(project, "countries") == 25